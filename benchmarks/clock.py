@@ -0,0 +1,88 @@
+"""
+Virtual wall clock for running the hcc window logic faster than real time.
+
+While installed, dt_util.now()/utcnow() return the virtual time and the
+point-in-time timers armed by the window models are queued here instead of
+on the event loop. Advancing the clock fires due timers in time order, each
+at its own instant, and lets the loop settle after every one so deferred
+state writes land before the next timer runs (the state writer flushes in a
+hass task, so hass.async_block_till_done() waits for it).
+
+Coordinator polling and other loop timers are untouched: they keep running
+on real time, which a replay of a few seconds never reaches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from contextlib import contextmanager
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Callable, Iterator, Optional
+from unittest.mock import patch
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from custom_components.hcc import window as hcc_window
+
+class VirtualClock:
+    def __init__(self, hass: HomeAssistant, start: datetime) -> None:
+        self._hass = hass
+        self.now = dt_util.as_utc(start)
+        self.fired = 0
+        self._timers: list[tuple[datetime, int, Callable[[datetime], Any]]] = []
+        self._cancelled: set[int] = set()
+        self._sequence = itertools.count()
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def local_now(self, time_zone: Optional[tzinfo] = None) -> datetime:
+        return self.now.astimezone(time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    @callback
+    def async_track_point_in_time(
+        self, hass: HomeAssistant, action: Callable[[datetime], Any], point_in_time: datetime
+    ) -> CALLBACK_TYPE:
+        sequence = next(self._sequence)
+        heapq.heappush(self._timers, (dt_util.as_utc(point_in_time), sequence, action))
+
+        @callback
+        def cancel() -> None:
+            self._cancelled.add(sequence)
+
+        return cancel
+
+    @contextmanager
+    def installed(self) -> Iterator[VirtualClock]:
+        """Route time and window timers through this clock; install before setting up entries."""
+        with patch.object(dt_util, "utcnow", self.utcnow), \
+                patch.object(dt_util, "now", self.local_now), \
+                patch.object(hcc_window, "async_track_point_in_time", self.async_track_point_in_time):
+            yield self
+
+    @property
+    def next_timer(self) -> Optional[datetime]:
+        while self._timers and self._timers[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._timers)[1])
+        return self._timers[0][0] if self._timers else None
+
+    async def async_advance_to(self, when: datetime) -> int:
+        """Fire every timer due up to `when`, then stop there; return how many fired."""
+        when = dt_util.as_utc(when)
+        fired = 0
+        while (due := self.next_timer) is not None and due <= when:
+            _at, _sequence, action = heapq.heappop(self._timers)
+            self.now = max(self.now, due)
+            if asyncio.iscoroutine(result := action(self.now)):
+                await result
+            fired += 1
+            await self._hass.async_block_till_done()
+        self.now = max(self.now, when)
+        self.fired += fired
+        return fired
+
+    async def async_advance(self, delta: timedelta) -> int:
+        return await self.async_advance_to(self.now + delta)
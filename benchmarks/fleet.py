@@ -0,0 +1,278 @@
+"""
+Fleet-scale benchmarks for the hcc integration.
+
+For each fleet size N, starts a Home Assistant test instance with N config
+entries pointing at the local mock endpoint (test_server/server.py with
+--synthetic, run in its own process so its CPU is not counted) and measures:
+
+    setup       wall and CPU time until every entry is set up
+    poll        CPU, wall time, state writes and upstream requests per fetch
+                of every entry, with the shared request caches emptied first
+    callbacks   time spent in HccBinTaskBinarySensor._update_state and
+                HccTaskCompletionSwitch._update_logic per simulated minute,
+                stepping a virtual clock (clock.py) over --minutes
+    memory      Python heap (tracemalloc) and resident set growth per entry
+
+Results are printed (or written with --output) as one JSON document.
+
+Needs Home Assistant and its test helpers:
+    pip install pytest-homeassistant-custom-component
+
+Run:
+    python benchmarks/fleet.py --sizes 1 10 100 500 --output fleet.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.const import EVENT_STATE_CHANGED, __version__ as HA_VERSION
+from homeassistant.core import callback
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from benchmarks.clock import VirtualClock
+from benchmarks.harness import add_entries, async_test_instance
+from custom_components.hcc.binary_sensor import HccBinTaskBinarySensor
+from custom_components.hcc.const import DOMAIN, DATA_COALESCER, DATA_RESPONSE_CACHE
+from custom_components.hcc.coordinator import entry_coordinators
+from custom_components.hcc.switch import HccTaskCompletionSwitch
+
+MOCK_SERVER = REPO_ROOT / "test_server" / "server.py"
+
+class CallTimer:
+    """Counts calls to, and perf_counter time spent in, wrapped methods."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+
+    @contextmanager
+    def wrapping(self, cls: type, name: str) -> Iterator[None]:
+        # Entities register bound methods as listeners, so the class must be
+        # patched before the entries are set up.
+        original = getattr(cls, name)
+
+        @functools.wraps(original)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - started
+                self.calls += 1
+
+        setattr(cls, name, timed)
+        try:
+            yield
+        finally:
+            setattr(cls, name, original)
+
+@contextmanager
+def mock_endpoint(latency: str) -> Iterator[str]:
+    """Run the mock server in a child process; yield its base URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, str(MOCK_SERVER), "--host", "127.0.0.1", "--port", str(port),
+         "--synthetic", "--latency", latency],
+        cwd=MOCK_SERVER.parent,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Mock server did not start")
+                time.sleep(0.05)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def _mock_control(base_url: str, path: str, method: str = "GET") -> dict:
+    request = urllib.request.Request(f"{base_url}{path}", method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(request, timeout=10) as response:
+        body = response.read()
+    return json.loads(body) if body else {}
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+async def run_fleet(size: int, base_url: str, args: argparse.Namespace, timer: CallTimer) -> dict[str, Any]:
+    async with async_test_instance() as hass:
+        # Window timers run on the virtual clock from setup on, so the
+        # simulated minutes below reach them.
+        with VirtualClock(hass, dt_util.utcnow()).installed() as clock:
+            addresses = [f"{i + 1} Benchmark Street, Hamilton" for i in range(size)]
+            entries = add_entries(hass, addresses, base_url, args.update_minutes, args.rate)
+
+            state_writes = 0
+
+            @callback
+            def _count_write(_event: Any) -> None:
+                nonlocal state_writes
+                state_writes += 1
+
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+            await hass.async_add_executor_job(_mock_control, base_url, "/__reset", "POST")
+
+            tracemalloc.start()
+            heap_before = tracemalloc.get_traced_memory()[0]
+            rss_before = _rss_bytes()
+            timer.reset()
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            assert await async_setup_component(hass, DOMAIN, {})
+            await hass.async_block_till_done()
+            setup_wall = time.perf_counter() - wall_started
+            setup_cpu = time.process_time() - cpu_started
+            heap_after = tracemalloc.get_traced_memory()[0]
+            rss_after = _rss_bytes()
+            tracemalloc.stop()
+            setup_writes = state_writes
+
+            coordinators = [c for entry in entries for c in entry_coordinators(hass, entry)]
+
+            # Every poll round must reach the mock: without this the coalescer
+            # answers from results under 30 s old and the response cache with 304s.
+            domain_data = hass.data[DOMAIN]
+            domain_data[DATA_COALESCER].freshness = 0
+            polls = []
+            for _round in range(args.polls):
+                domain_data[DATA_RESPONSE_CACHE].clear()
+                requests_before = (await hass.async_add_executor_job(_mock_control, base_url, "/__stats"))["requests"]
+                state_writes = 0
+                wall_started, cpu_started = time.perf_counter(), time.process_time()
+                await asyncio.gather(*(coordinator.async_fetch_now() for coordinator in coordinators))
+                await hass.async_block_till_done()
+                wall_ms = (time.perf_counter() - wall_started) * 1000
+                cpu_ms = (time.process_time() - cpu_started) * 1000
+                requests = (await hass.async_add_executor_job(_mock_control, base_url, "/__stats"))["requests"] - requests_before
+                if requests < len(coordinators):
+                    raise RuntimeError(f"Poll round reached the mock {requests} times for {len(coordinators)} entries")
+                polls.append({"wall_ms": wall_ms, "cpu_ms": cpu_ms, "state_writes": state_writes, "requests": requests})
+
+            timer.reset()
+            state_writes = 0
+            fired_before = clock.fired
+            for _minute in range(args.minutes):
+                await clock.async_advance(timedelta(minutes=1))
+                await hass.async_block_till_done()
+            transitions = clock.fired - fired_before
+
+            mock_stats = await hass.async_add_executor_job(_mock_control, base_url, "/__stats")
+
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+    def _mean(key: str) -> Optional[float]:
+        return sum(p[key] for p in polls) / len(polls) if polls else None
+
+    return {
+        "entries": size,
+        "setup": {
+            "wall_s": setup_wall,
+            "cpu_s": setup_cpu,
+            "wall_ms_per_entry": setup_wall * 1000 / size,
+            "state_writes": setup_writes,
+        },
+        "poll": {
+            "rounds": polls,
+            "mean_wall_ms": _mean("wall_ms"),
+            "mean_cpu_ms": _mean("cpu_ms"),
+            "mean_cpu_ms_per_entry": (_mean("cpu_ms") or 0) / size if polls else None,
+            "mean_state_writes": _mean("state_writes"),
+            "mean_requests": _mean("requests"),
+        },
+        "callbacks": {
+            "simulated_minutes": args.minutes,
+            "window_transitions": transitions,
+            "calls": timer.calls,
+            "total_ms": timer.seconds * 1000,
+            "ms_per_minute": timer.seconds * 1000 / args.minutes if args.minutes else None,
+            "state_writes": state_writes,
+        },
+        "memory": {
+            "heap_bytes_per_entry": (heap_after - heap_before) / size,
+            "rss_bytes_per_entry": (rss_after - rss_before) / size if rss_before and rss_after else None,
+        },
+        "mock": {
+            "requests": mock_stats.get("requests"),
+            "outcomes": mock_stats.get("outcomes"),
+            "duration_ms": mock_stats.get("duration_ms"),
+        },
+    }
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    state_timer = CallTimer()
+    results = []
+    with mock_endpoint(args.latency) as base_url:
+        with state_timer.wrapping(HccBinTaskBinarySensor, "_update_state"), \
+                state_timer.wrapping(HccTaskCompletionSwitch, "_update_logic"):
+            for size in args.sizes:
+                results.append(await run_fleet(size, base_url, args, state_timer))
+                print(f"N={size}: setup {results[-1]['setup']['wall_s']:.2f}s", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().astimezone().isoformat(),
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 500], help="fleet sizes to run")
+    parser.add_argument("--polls", type=int, default=3, help="fetch rounds measured per fleet")
+    parser.add_argument("--minutes", type=int, default=2 * 24 * 60, help="simulated minutes for callback timing")
+    parser.add_argument("--update-minutes", type=int, default=60)
+    parser.add_argument("--latency", default="fixed:0", help="mock latency distribution (see test_server/server.py)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="scheduler requests per second (default: unlimited)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    report = json.dumps(asyncio.run(_main(arguments)), indent=2, default=str)
+    if arguments.output:
+        Path(arguments.output).write_text(report + "\n")
+    else:
+        print(report)
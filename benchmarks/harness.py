@@ -0,0 +1,83 @@
+"""Home Assistant test instances with hcc entries, shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import tempfile
+from contextlib import ExitStack, asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, Optional
+from unittest.mock import patch
+
+from aiohttp.resolver import ThreadedResolver
+from homeassistant import loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+from custom_components.hcc.const import (
+    DOMAIN,
+    CONF_ADDRESS,
+    CONF_API_URL,
+    CONF_UPDATE_MINUTES,
+    DATA_FETCH_SCHEDULER,
+    canonical_address,
+)
+from custom_components.hcc.scheduler import HccFetchScheduler
+
+MOCK_PATH = "/FightTheLandFill/get_Collection_Dates"
+TIME_ZONE = "Pacific/Auckland"
+
+@asynccontextmanager
+async def async_test_instance() -> AsyncIterator[HomeAssistant]:
+    """A test instance in Hamilton's time zone that loads hcc from this checkout."""
+    # A throwaway config dir keeps .storage (snapshots, restore state) out of the repo.
+    with tempfile.TemporaryDirectory() as config_dir, ExitStack() as stack:
+        # The shared client session resolves through zeroconf, which needs the
+        # network integration; the mock is on 127.0.0.1, so a plain resolver does.
+        if hasattr(aiohttp_client, "_async_make_resolver"):
+            stack.enter_context(patch.object(aiohttp_client, "_async_make_resolver", return_value=ThreadedResolver()))
+        async with async_test_home_assistant() as hass:
+            hass.config.config_dir = config_dir
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            if hasattr(hass.config, "async_set_time_zone"):
+                await hass.config.async_set_time_zone(TIME_ZONE)
+            else:
+                hass.config.set_time_zone(TIME_ZONE)
+            yield hass
+
+def add_entries(
+    hass: HomeAssistant,
+    addresses: list[str],
+    base_url: str,
+    update_minutes: int = 60,
+    rate: Optional[float] = None,
+) -> list[MockConfigEntry]:
+    """
+    Add one config entry per address against the mock at base_url.
+
+    Without a rate the fetch scheduler's limit is lifted, so setup measures
+    the integration rather than the request budget. First fetches are not
+    staggered: they start as soon as setup is done, so waiting for the loop
+    to settle after setup includes them.
+    """
+    if rate:
+        scheduler = HccFetchScheduler(rate=rate, burst=max(1, int(rate)), stagger=timedelta(0))
+    else:
+        scheduler = HccFetchScheduler(rate=1e9, burst=max(1, len(addresses) * 4), stagger=timedelta(0))
+    hass.data.setdefault(DOMAIN, {})[DATA_FETCH_SCHEDULER] = scheduler
+
+    entries = []
+    for address in addresses:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"HCC Bin: {address}",
+            data={
+                CONF_ADDRESS: address,
+                CONF_API_URL: f"{base_url}{MOCK_PATH}",
+                CONF_UPDATE_MINUTES: update_minutes,
+            },
+            unique_id=f"hcc_bin_{canonical_address(address)}",
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    return entries
@@ -0,0 +1,387 @@
+"""
+Replay a year of window activity through the hcc integration on a virtual clock.
+
+Sets up one entry per address, then feeds each address a schedule of
+fortnightly red/yellow collection dates (with the odd holiday shift), window
+hour changes through the number entities and task completions through the
+switches. The clock (clock.py) jumps from event to event, so a year for
+dozens of addresses takes seconds.
+
+Every switch and "due" binary sensor transition is recorded with its virtual
+time and checked against a reference model that derives the same states
+from the schedule alone. The run exits non-zero on any mismatch, so it works
+as a correctness check as well as a throughput benchmark for the window
+logic; the JSON report has both.
+
+Needs Home Assistant and its test helpers:
+    pip install pytest-homeassistant-custom-component
+
+Run:
+    python benchmarks/replay.py --addresses 36 --days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import replace
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from benchmarks.clock import VirtualClock
+from benchmarks.harness import TIME_ZONE, add_entries, async_test_instance
+from custom_components.hcc.const import DOMAIN
+from custom_components.hcc.coordinator import HccCoordinator, entry_coordinators
+from custom_components.hcc.number import NUMBER_TYPES
+from custom_components.hcc.window import TRANSITION_GRACE, WINDOW_TASKS
+from test_server.server import MockServer
+
+COLLECTION_PERIOD = timedelta(days=14)
+HOLIDAY_SHIFT_RATE = 0.04
+HOURS_CHANGE_MEAN_DAYS = 10.0
+COMPLETION_GAP_HOURS = (4.0, 12.0)
+UNDO_RATE = 0.2
+# Actions happen at :17 seconds; window bounds fall on whole or half hours (+1s).
+ACTION_SECOND = 17
+MAX_REPORTED = 20
+
+class ReferenceAddress:
+    """
+    The task entity states of one address, derived from its dates, hours
+    and completions without going through the integration.
+    """
+
+    def __init__(self, slug: str, zone: ZoneInfo) -> None:
+        self.slug = slug
+        self.zone = zone
+        self.dates: dict[str, date] = {}
+        self.hours = {key: default for key, _name, default in NUMBER_TYPES}
+        self.completed = {task_key: False for task_key, *_rest in WINDOW_TASKS}
+        self.shown: dict[str, str] = {}
+        self._windows: Optional[dict[str, tuple[datetime, datetime]]] = None
+
+    def switch_id(self, task_key: str) -> str:
+        return f"switch.hcc_bin_{self.slug}_{task_key}_complete"
+
+    def due_id(self, task_key: str) -> str:
+        return f"binary_sensor.hcc_bin_{self.slug}_{task_key}_due"
+
+    def number_id(self, key: str) -> str:
+        return f"number.hcc_bin_{self.slug}_{key}"
+
+    def set_date(self, bin_color: str, collection_date: date) -> None:
+        self.dates[bin_color] = collection_date
+        self._windows = None
+
+    def set_hours(self, key: str, value: float) -> None:
+        self.hours[key] = value
+        self._windows = None
+
+    def windows(self) -> dict[str, tuple[datetime, datetime]]:
+        if self._windows is None:
+            self._windows = {}
+            for task_key, bin_color, task_type, pre_key, post_key in WINDOW_TASKS:
+                if (collection_date := self.dates.get(bin_color)) is None:
+                    continue
+                # Wall-clock hours either side of local midnight of the
+                # collection day (put out) or the day after (bring in).
+                anchor = collection_date if task_type == "out" else collection_date + timedelta(days=1)
+                midnight = datetime.combine(anchor, dt_time())
+                start = midnight - timedelta(hours=self.hours[pre_key])
+                end = midnight + timedelta(hours=self.hours[post_key])
+                self._windows[task_key] = (self._instant(start), self._instant(end))
+        return self._windows
+
+    def _instant(self, wall: datetime) -> datetime:
+        """
+        The UTC instant at which the local clock shows the naive `wall`.
+
+        Found only by converting UTC to local time, never by attaching the
+        zone to a wall time as the integration does: every UTC offset in use
+        around `wall` gives a candidate instant, and the first one the clock
+        really shows `wall` at wins (the first pass through the hour repeated
+        when DST ends). A wall time skipped when DST starts has none; the
+        earliest candidate past the gap is used.
+        """
+        around = wall.replace(tzinfo=timezone.utc)
+        offsets = {(around + timedelta(hours=h)).astimezone(self.zone).utcoffset() for h in range(-36, 37, 3)}
+        candidates = sorted((wall - offset).replace(tzinfo=timezone.utc) for offset in offsets)
+        shown = [(instant, instant.astimezone(self.zone).replace(tzinfo=None)) for instant in candidates]
+        return next(
+            (instant for instant, local in shown if local == wall),
+            next(instant for instant, local in shown if local > wall),
+        )
+
+    def is_active(self, task_key: str, now: datetime) -> bool:
+        bounds = self.windows().get(task_key)
+        return bounds is not None and bounds[0] <= now <= bounds[1]
+
+    def next_change(self, now: datetime) -> Optional[datetime]:
+        changes = [
+            when
+            for start, end in self.windows().values()
+            for when in (start, end + TRANSITION_GRACE)
+            if when > now
+        ]
+        return min(changes, default=None)
+
+    def evaluate(self, now: datetime) -> list[tuple[str, str]]:
+        """Return (entity_id, state) for every entity whose state changed."""
+        changed = []
+        for task_key, *_rest in WINDOW_TASKS:
+            active = self.is_active(task_key, now)
+            if not active:
+                self.completed[task_key] = False
+            completed = self.completed[task_key]
+            states = {
+                self.switch_id(task_key): "on" if completed else ("off" if active else "unavailable"),
+                self.due_id(task_key): "on" if active and not completed else "off",
+            }
+            for entity_id, state in states.items():
+                if self.shown.get(entity_id) != state:
+                    self.shown[entity_id] = state
+                    changed.append((entity_id, state))
+        return changed
+
+class Replay:
+    def __init__(self, hass: HomeAssistant, clock: VirtualClock, args: argparse.Namespace) -> None:
+        self._hass = hass
+        self._clock = clock
+        self._rng = random.Random(args.seed)
+        self._zone = ZoneInfo(TIME_ZONE)
+        self.start = clock.now
+        self.end = clock.now + timedelta(days=args.days)
+        self.coordinators: list[HccCoordinator] = []
+        self.references: list[ReferenceAddress] = []
+        self.expected: list[tuple[datetime, str, str]] = []
+        self.observed: list[tuple[datetime, str, str]] = []
+        self.actions: Counter[str] = Counter()
+        self._queue: list[tuple[datetime, int, str, int, Any]] = []
+        self._sequence = itertools.count()
+        self._next_change: list[Optional[datetime]] = []
+        self._tracked: set[str] = set()
+
+    def add(self, coordinator: HccCoordinator) -> None:
+        index = len(self.coordinators)
+        reference = ReferenceAddress(coordinator.slug, self._zone)
+        self.coordinators.append(coordinator)
+        self.references.append(reference)
+        self._next_change.append(None)
+        for task_key, *_rest in WINDOW_TASKS:
+            self._tracked.update((reference.switch_id(task_key), reference.due_id(task_key)))
+
+        # Fortnightly collections, red and yellow on alternate weeks.
+        today = self.start.astimezone(self._zone).date()
+        first = {"red": today + timedelta(days=self._rng.randrange(14))}
+        first["yellow"] = first["red"] + timedelta(days=7 if first["red"] - today < timedelta(days=7) else -7)
+        for bin_color, collection_date in first.items():
+            reference.set_date(bin_color, collection_date)
+            lattice = collection_date
+            while collection_date < self.end.date():
+                lattice += COLLECTION_PERIOD
+                following = lattice
+                if self._rng.random() < HOLIDAY_SHIFT_RATE:
+                    following += timedelta(days=1)
+                # The API moves on to the next date around midday after a collection.
+                self._push(self._local(collection_date + timedelta(days=1), 12), "date", index, (bin_color, following))
+                collection_date = following
+
+        when = self.start
+        while True:
+            when += timedelta(days=self._rng.expovariate(1 / HOURS_CHANGE_MEAN_DAYS))
+            if when >= self.end:
+                break
+            key = self._rng.choice(NUMBER_TYPES)[0]
+            self._push(when, "hours", index, (key, self._rng.randrange(0, 25) / 2))
+
+        when = self.start
+        while True:
+            when += timedelta(hours=self._rng.uniform(*COMPLETION_GAP_HOURS))
+            if when >= self.end:
+                break
+            self._push(when, "complete", index, self._rng.choice(WINDOW_TASKS)[0])
+
+    def _local(self, day: date, hour: int) -> datetime:
+        minute = self._rng.randrange(60)
+        return datetime.combine(day, dt_time(hour, minute), tzinfo=self._zone).astimezone(timezone.utc)
+
+    def _push(self, when: datetime, kind: str, index: int, payload: Any) -> None:
+        when = when.replace(second=ACTION_SECOND, microsecond=0)
+        heapq.heappush(self._queue, (when, next(self._sequence), kind, index, payload))
+
+    async def async_feed_initial(self) -> list[tuple[str, str, str]]:
+        """Feed every address its first dates; return (entity_id, expected, actual) mismatches."""
+        for coordinator, reference in zip(self.coordinators, self.references):
+            coordinator.async_set_updated_data(
+                replace(coordinator.data, red=reference.dates["red"], yellow=reference.dates["yellow"])
+            )
+        await self._hass.async_block_till_done()
+
+        mismatches = []
+        for index, reference in enumerate(self.references):
+            reference.evaluate(self.start)
+            self._next_change[index] = reference.next_change(self.start)
+            for entity_id, expected in reference.shown.items():
+                state = self._hass.states.get(entity_id)
+                if (actual := state.state if state else None) != expected:
+                    mismatches.append((entity_id, expected, actual))
+        self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._record)
+        return mismatches
+
+    @callback
+    def _record(self, event: Event) -> None:
+        if event.data["entity_id"] not in self._tracked:
+            return
+        old_state, new_state = event.data.get("old_state"), event.data.get("new_state")
+        if new_state is None or (old_state is not None and old_state.state == new_state.state):
+            return
+        self.observed.append((self._clock.now, new_state.entity_id, new_state.state))
+
+    async def async_run(self) -> None:
+        while True:
+            upcoming = [when for when in self._next_change if when is not None]
+            if self._queue:
+                upcoming.append(self._queue[0][0])
+            if not upcoming or (now := min(upcoming)) > self.end:
+                break
+
+            await self._clock.async_advance_to(now)
+            for index, when in enumerate(self._next_change):
+                if when == now:
+                    self._evaluate(index, now)
+            while self._queue and self._queue[0][0] == now:
+                _when, _sequence, kind, index, payload = heapq.heappop(self._queue)
+                await self._async_apply(kind, index, payload, now)
+                self._evaluate(index, now)
+
+        await self._clock.async_advance_to(self.end)
+
+    def _evaluate(self, index: int, now: datetime) -> None:
+        reference = self.references[index]
+        self.expected.extend((now, entity_id, state) for entity_id, state in reference.evaluate(now))
+        self._next_change[index] = reference.next_change(now)
+
+    async def _async_apply(self, kind: str, index: int, payload: Any, now: datetime) -> None:
+        reference, coordinator = self.references[index], self.coordinators[index]
+        if kind == "date":
+            bin_color, collection_date = payload
+            reference.set_date(bin_color, collection_date)
+            coordinator.async_set_updated_data(replace(coordinator.data, **{bin_color: collection_date}))
+        elif kind == "hours":
+            key, value = payload
+            reference.set_hours(key, value)
+            await self._hass.services.async_call(
+                "number", "set_value", {"entity_id": reference.number_id(key), "value": value}, blocking=True
+            )
+        else:
+            task_key = payload
+            if reference.completed[task_key] and self._rng.random() < UNDO_RATE:
+                reference.completed[task_key] = False
+                service = "turn_off"
+            elif not reference.completed[task_key] and reference.is_active(task_key, now):
+                reference.completed[task_key] = True
+                service = "turn_on"
+            else:
+                return
+            await self._hass.services.async_call(
+                "switch", service, {"entity_id": reference.switch_id(task_key)}, blocking=True
+            )
+            kind = service
+        self.actions[kind] += 1
+        await self._hass.async_block_till_done()
+
+def _format(transitions: Counter) -> list[str]:
+    return [
+        f"{when.isoformat()} {entity_id} -> {state}"
+        for when, entity_id, state in sorted(transitions.elements())[:MAX_REPORTED]
+    ]
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    mock = MockServer(data_file=None, synthetic=True)
+    port = await mock.start("127.0.0.1", 0)
+    try:
+        async with async_test_instance() as hass:
+            start = dt_util.utcnow().replace(second=0, microsecond=0)
+            with VirtualClock(hass, start).installed() as clock:
+                addresses = [f"{i + 1} Replay Road, Hamilton" for i in range(args.addresses)]
+                entries = add_entries(hass, addresses, f"http://127.0.0.1:{port}", update_minutes=1440)
+
+                started = time.perf_counter()
+                assert await async_setup_component(hass, DOMAIN, {})
+                await hass.async_block_till_done()
+                setup_seconds = time.perf_counter() - started
+
+                replay = Replay(hass, clock, args)
+                for entry in entries:
+                    for coordinator in entry_coordinators(hass, entry):
+                        replay.add(coordinator)
+                baseline = await replay.async_feed_initial()
+
+                fired_before = clock.fired
+                started = time.perf_counter()
+                await replay.async_run()
+                replay_seconds = time.perf_counter() - started
+
+                for entry in entries:
+                    await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_block_till_done()
+    finally:
+        await mock.stop()
+
+    expected, observed = Counter(replay.expected), Counter(replay.observed)
+    missing, unexpected = expected - observed, observed - expected
+    return {
+        "addresses": args.addresses,
+        "days": args.days,
+        "seed": args.seed,
+        "ok": not (baseline or missing or unexpected),
+        "setup_s": setup_seconds,
+        "replay_s": replay_seconds,
+        "simulated_days_per_second": args.days / replay_seconds if replay_seconds else None,
+        "timers_fired": clock.fired - fired_before,
+        "actions": dict(replay.actions),
+        "transitions": {"expected": len(replay.expected), "observed": len(replay.observed)},
+        "mismatches": {
+            "baseline": [
+                {"entity_id": entity_id, "expected": want, "actual": got}
+                for entity_id, want, got in baseline[:MAX_REPORTED]
+            ],
+            "missing": _format(missing),
+            "unexpected": _format(unexpected),
+        },
+    }
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=36)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    result = asyncio.run(_main(arguments))
+    report = json.dumps(result, indent=2)
+    if arguments.output:
+        Path(arguments.output).write_text(report + "\n")
+    else:
+        print(report)
+    sys.exit(0 if result["ok"] else 1)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 
 from .const import (
     DOMAIN,
@@ -15,12 +17,41 @@ from .const import (
     CONF_ADDRESS,
     CONF_UPDATE_MINUTES,
     CONF_API_URL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADDRESSES,
+    CONF_PROFILING,
+    CONF_PROFILE_BUDGET_MS,
+    CONF_WINDOW_PROFILE,
+    CONF_WINDOW_HOURS,
+    DATA_WINDOW_SEEDS,
     DEFAULT_UPDATE_MINUTES,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_PROFILING,
+    DEFAULT_PROFILE_BUDGET_MS,
     MIN_UPDATE_MINUTES,
     MAX_UPDATE_MINUTES,
     API_BASE,
 )
-from .coordinator import HccCoordinator
+from .api import create_api_client, get_circuit_breaker
+from .config_flow import hub_unique_id
+from .coordinator import HccCoordinator, HccHubCoordinator, entry_coordinators
+from .profiler import HccProfiler
+from .scheduler import get_fetch_scheduler
+from .services import async_setup_services
+from .store import async_get_snapshot_store, hub_snapshot_key
+from .window import HccWindowProfile
+
+def _distinct_hubs(items: list[dict]) -> list[dict]:
+    """Hubs are keyed by their name, so with several each needs a name of its own."""
+    hubs = [item for item in items if CONF_ADDRESSES in item]
+    if len(hubs) > 1 and any(CONF_NAME not in item for item in hubs):
+        raise vol.Invalid(f"every hub needs a {CONF_NAME} when there is more than one")
+    seen: set[str] = set()
+    for item in hubs:
+        if (unique_id := hub_unique_id(item.get(CONF_NAME))) in seen:
+            raise vol.Invalid(f"hub {CONF_NAME} {item[CONF_NAME]!r} is used twice (names are compared as slugs)")
+        seen.add(unique_id)
+    return items
 
 # ----- YAML configuration schema -----
 CONFIG_SCHEMA = vol.Schema(
@@ -28,34 +59,50 @@ CONFIG_SCHEMA = vol.Schema(
         DOMAIN: vol.All(
             cv.ensure_list,
             [
-                vol.Schema(
-                    {
-                        vol.Required(CONF_ADDRESS): cv.string,
-                        vol.Optional(
-                            CONF_UPDATE_MINUTES, default=DEFAULT_UPDATE_MINUTES
-                        ): vol.All(int, vol.Range(min=MIN_UPDATE_MINUTES, max=MAX_UPDATE_MINUTES)),
-                        vol.Optional(CONF_API_URL): cv.string,
-                    }
+                vol.All(
+                    cv.has_at_least_one_key(CONF_ADDRESS, CONF_ADDRESSES),
+                    vol.Schema(
+                        {
+                            vol.Exclusive(CONF_ADDRESS, "address"): cv.string,
+                            # Hub mode: one entry polling all of these addresses
+                            vol.Exclusive(CONF_ADDRESSES, "address"): vol.All(cv.ensure_list, [cv.string]),
+                            # Identifies a hub; required when there is more than one
+                            vol.Optional(CONF_NAME): cv.string,
+                            vol.Optional(
+                                CONF_UPDATE_MINUTES, default=DEFAULT_UPDATE_MINUTES
+                            ): vol.All(int, vol.Range(min=MIN_UPDATE_MINUTES, max=MAX_UPDATE_MINUTES)),
+                            vol.Optional(CONF_API_URL): cv.string,
+                            vol.Optional(CONF_ADAPTIVE_POLLING): cv.boolean,
+                        }
+                    ),
                 )
             ],
+            _distinct_hubs,
         )
     },
     extra=vol.ALLOW_EXTRA,
 )
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    async_setup_services(hass)
+
     yaml_list = config.get(DOMAIN)
     if not yaml_list:
         return True
 
     for item in yaml_list:
-        data = {
-            CONF_ADDRESS: item[CONF_ADDRESS].strip(),
-            CONF_UPDATE_MINUTES: item.get(CONF_UPDATE_MINUTES, DEFAULT_UPDATE_MINUTES),
-        }
+        data = {CONF_UPDATE_MINUTES: item.get(CONF_UPDATE_MINUTES, DEFAULT_UPDATE_MINUTES)}
+        if CONF_ADDRESSES in item:
+            data[CONF_ADDRESSES] = [address.strip() for address in item[CONF_ADDRESSES]]
+            if CONF_NAME in item:
+                data[CONF_NAME] = item[CONF_NAME].strip()
+        else:
+            data[CONF_ADDRESS] = item[CONF_ADDRESS].strip()
         # If API URL is provided in YAML, add it to data
         if CONF_API_URL in item:
             data[CONF_API_URL] = item[CONF_API_URL].strip()
+        if CONF_ADAPTIVE_POLLING in item:
+            data[CONF_ADAPTIVE_POLLING] = item[CONF_ADAPTIVE_POLLING]
 
         hass.async_create_task(
             hass.config_entries.flow.async_init(
@@ -68,34 +115,187 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
 type HccConfigEntry = config_entries.ConfigEntry
 
-async def async_setup_entry(hass: HomeAssistant, entry: HccConfigEntry) -> bool:
-    address = entry.data[CONF_ADDRESS]
+def _entry_settings(entry: HccConfigEntry) -> tuple[int, bool, str]:
+    """Update minutes, adaptive polling and API URL; options win over data."""
     minutes = entry.options.get(
         CONF_UPDATE_MINUTES,
         entry.data.get(CONF_UPDATE_MINUTES, DEFAULT_UPDATE_MINUTES),
     )
+    adaptive = entry.options.get(
+        CONF_ADAPTIVE_POLLING,
+        entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+    )
     # Read API URL from data, fallback to constant
     api_url = entry.data.get(CONF_API_URL, API_BASE)
+    return minutes, adaptive, api_url
+
+def _window_profile(entry: HccConfigEntry) -> Optional[HccWindowProfile]:
+    """The entry's window profile, or None while the hour number entities are used."""
+    if not entry.options.get(CONF_WINDOW_PROFILE, False):
+        return None
+    return HccWindowProfile.from_options(entry.options.get(CONF_WINDOW_HOURS))
+
+def _profiler_settings(entry: HccConfigEntry) -> tuple[bool, float]:
+    """Profiling switch and per-call budget in ms; options only."""
+    return (
+        entry.options.get(CONF_PROFILING, DEFAULT_PROFILING),
+        entry.options.get(CONF_PROFILE_BUDGET_MS, DEFAULT_PROFILE_BUDGET_MS),
+    )
+
+@callback
+def _async_schedule_first_refresh(
+    hass: HomeAssistant, entry: HccConfigEntry, coordinator: DataUpdateCoordinator[Any], hydrated: bool
+) -> None:
+    """
+    Refresh without blocking setup. An entry hydrated from its snapshot
+    already shows data, so it waits a per-entry offset and a fleet of entries
+    does not poll in lockstep after startup; one without data refreshes now.
+    """
+    if not hydrated:
+        entry.async_create_background_task(hass, coordinator.async_refresh(), "hcc first refresh")
+        return
 
-    session = async_get_clientsession(hass)
+    async def _async_initial_refresh(_now) -> None:
+        await coordinator.async_refresh()
+
+    delay = get_fetch_scheduler(hass).stagger_delay(entry.entry_id, coordinator.update_interval)
+    entry.async_on_unload(async_call_later(hass, delay, _async_initial_refresh))
+
+@callback
+def _async_migrate_devices(hass: HomeAssistant, coordinators: list[HccCoordinator]) -> None:
+    """Move devices identified by the lower-cased address onto the canonical address."""
+    registry = dr.async_get(hass)
+    for coordinator in coordinators:
+        legacy = (DOMAIN, f"addr:{coordinator.address.lower()}")
+        current = (DOMAIN, f"addr:{coordinator.canonical_address}")
+        if legacy == current or registry.async_get_device(identifiers={current}) is not None:
+            continue
+        if (device := registry.async_get_device(identifiers={legacy})) is not None:
+            registry.async_update_device(device.id, new_identifiers={current})
+
+async def async_setup_entry(hass: HomeAssistant, entry: HccConfigEntry) -> bool:
+    if CONF_ADDRESSES in entry.data:
+        return await _async_setup_hub_entry(hass, entry)
+
+    address = entry.data[CONF_ADDRESS]
+    minutes, adaptive, api_url = _entry_settings(entry)
+    profiler = HccProfiler(hass, entry.entry_id, *_profiler_settings(entry))
+
+    snapshots = await async_get_snapshot_store(hass)
     coordinator = HccCoordinator(
         hass=hass,
         address=address,
         update_interval=timedelta(minutes=minutes),
-        session=session,
-        api_url=api_url,  # <-- Pass it here
+        client=create_api_client(hass, api_url, profiler),
+        adaptive=adaptive,
+        snapshots=snapshots,
+        forecast_history=snapshots.get_history(entry.entry_id),
+        window_profile=_window_profile(entry),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    if (snapshot := snapshots.get(entry.entry_id)) is not None:
+        coordinator.data = snapshot
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    _async_schedule_first_refresh(hass, entry, coordinator, hydrated=snapshot is not None)
+
+    # Resolve entity ids before the platforms add entities that look them up.
+    coordinator.entity_index.async_start()
+    _async_migrate_devices(hass, [coordinator])
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.windows.async_start()
+    entry.async_on_unload(entry.add_update_listener(async_update_listener))
     return True
 
+async def _async_setup_hub_entry(hass: HomeAssistant, entry: HccConfigEntry) -> bool:
+    minutes, _adaptive, api_url = _entry_settings(entry)
+    profiler = HccProfiler(hass, entry.entry_id, *_profiler_settings(entry))
+    window_profile = _window_profile(entry)
+    snapshots = await async_get_snapshot_store(hass)
+
+    # Per-address coordinators without timers of their own; the hub polls them.
+    children: dict[str, HccCoordinator] = {}
+    hydrated = True
+    for address in entry.data[CONF_ADDRESSES]:
+        snapshot_key = hub_snapshot_key(entry.entry_id, address)
+        child = HccCoordinator(
+            hass=hass,
+            address=address,
+            update_interval=None,
+            client=create_api_client(hass, api_url, profiler),
+            snapshots=snapshots,
+            forecast_history=snapshots.get_history(snapshot_key),
+            snapshot_key=snapshot_key,
+            window_profile=window_profile,
+        )
+        if (snapshot := snapshots.get(snapshot_key)) is not None:
+            child.data = snapshot
+        else:
+            hydrated = False
+        children[address] = child
+
+    hub = HccHubCoordinator(hass, timedelta(minutes=minutes), children, profiler=profiler)
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = hub
+    _async_schedule_first_refresh(hass, entry, hub, hydrated=hydrated)
+
+    for child in children.values():
+        child.entity_index.async_start()
+    _async_migrate_devices(hass, list(children.values()))
+    # The hub's only listener fans each batch out to the addresses, and keeps it polling.
+    entry.async_on_unload(hub.async_add_listener(hub.async_push_to_children))
+    hub.async_push_to_children()
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    for child in children.values():
+        child.windows.async_start()
+    entry.async_on_unload(entry.add_update_listener(async_update_listener))
+    return True
+
+async def async_update_listener(hass: HomeAssistant, entry: HccConfigEntry) -> None:
+    """Apply option and data changes in place; a new address or window profile mode needs a reload."""
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    minutes, adaptive, api_url = _entry_settings(entry)
+    runtime.profiler.configure(*_profiler_settings(entry))
+
+    # Turning the profile on or off adds or removes the hour number entities.
+    window_profile = _window_profile(entry)
+    coordinators = entry_coordinators(hass, entry)
+    if (window_profile is None) != (coordinators[0].windows.profile is None):
+        if window_profile is None:
+            # The hour numbers come back with the profile's hours, not their old states.
+            hass.data[DOMAIN].setdefault(DATA_WINDOW_SEEDS, {})[entry.entry_id] = coordinators[0].windows.profile
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    if window_profile is not None:
+        for coordinator in coordinators:
+            coordinator.windows.async_set_profile(window_profile)
+
+    if isinstance(runtime, HccHubCoordinator):
+        if list(entry.data[CONF_ADDRESSES]) != list(runtime.children):
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
+        for child in runtime.children.values():
+            child.client.set_api_url(api_url, get_circuit_breaker(hass, api_url))
+        runtime.async_apply_settings(timedelta(minutes=minutes))
+        return
+
+    if entry.data[CONF_ADDRESS] != runtime.address:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    runtime.client.set_api_url(api_url, get_circuit_breaker(hass, api_url))
+    runtime.async_apply_settings(timedelta(minutes=minutes), adaptive)
+
 async def async_unload_entry(hass: HomeAssistant, entry: HccConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: HccConfigEntry) -> None:
+    snapshots = await async_get_snapshot_store(hass)
+    snapshots.async_remove(entry.entry_id)
\ No newline at end of file
@@ -1,31 +1,322 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
 from datetime import datetime, date as dt_date
+from urllib.parse import urlsplit
 import asyncio
+import json
+import random
+import time
 import aiohttp
 
-from .const import API_BASE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    API_BASE,
+    canonical_address,
+    DOMAIN,
+    DATA_COALESCER,
+    DATA_RESPONSE_CACHE,
+    DATA_BREAKERS,
+    COALESCE_FRESHNESS_SECONDS,
+    RESPONSE_CACHE_SIZE,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_SECONDS,
+    RETRY_MAX_SECONDS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    BREAKER_CLOSED,
+    BREAKER_OPEN,
+    BREAKER_HALF_OPEN,
+)
+from .metrics import HccFetchMetrics
+from .profiler import HccProfiler, profiled
+from .scheduler import HccFetchScheduler, get_fetch_scheduler
+
+CollectionDates = Tuple[Optional[dt_date], Optional[dt_date]]
+_RequestKey = Tuple[str, str]
+
+@dataclass(slots=True)
+class _CachedResponse:
+    result: CollectionDates
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+def _parse_max_age(cache_control: Optional[str]) -> Optional[float]:
+    """Return the freshness lifetime in seconds, 0 for no-cache, None for no-store."""
+    if not cache_control:
+        return 0.0
+    max_age = 0.0
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        name = name.lower()
+        if name == "no-store":
+            return None
+        if name == "no-cache":
+            return 0.0
+        if name == "max-age":
+            try:
+                max_age = max(0.0, float(value.strip('"')))
+            except ValueError:
+                pass
+    return max_age
+
+class HccCircuitOpenError(aiohttp.ClientError):
+    """Raised without contacting the API while its circuit breaker is open."""
+
+def _is_retryable(ex: Exception) -> bool:
+    if isinstance(ex, HccCircuitOpenError):
+        return False
+    if isinstance(ex, aiohttp.ClientResponseError):
+        # Other 4xx responses are about the request, not the health of the host.
+        return ex.status >= 500 or ex.status == 429
+    return isinstance(ex, (asyncio.TimeoutError, aiohttp.ClientError))
+
+class HccCircuitBreaker:
+    """
+    Per-host breaker shared by every entry using the same API.
+
+    Opens after `failure_threshold` consecutive failed requests and fails fast
+    until `reset_timeout` has passed, then lets a single half-open probe
+    through; the probe's outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_SECONDS,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self.state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_request(self) -> None:
+        if self.state == BREAKER_OPEN:
+            if time.monotonic() - self._opened_at < self._reset_timeout:
+                raise HccCircuitOpenError("Circuit breaker open")
+            self.state = BREAKER_HALF_OPEN
+        if self.state == BREAKER_HALF_OPEN:
+            if self._probe_in_flight:
+                raise HccCircuitOpenError("Circuit breaker probe in progress")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = BREAKER_CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Forget an abandoned half-open probe so another request may try."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self._failures >= self._failure_threshold:
+            self.state = BREAKER_OPEN
+            self._opened_at = time.monotonic()
+
+class HccRequestCoalescer:
+    """
+    Single-flight de-duplication of collection date requests.
+
+    Concurrent callers for the same (api_url, address) await one shared
+    request, and a result that completed less than `freshness` seconds ago
+    is served from memory.
+    """
+
+    def __init__(self, freshness: float = COALESCE_FRESHNESS_SECONDS) -> None:
+        self.freshness = freshness
+        self._in_flight: Dict[_RequestKey, asyncio.Task[CollectionDates]] = {}
+        self._recent: Dict[_RequestKey, Tuple[float, CollectionDates]] = {}
+
+    async def async_fetch(self, key: _RequestKey, fetch: Callable[[], Awaitable[CollectionDates]]) -> CollectionDates:
+        if (recent := self._recent.get(key)) is not None:
+            completed_at, result = recent
+            if time.monotonic() - completed_at < self.freshness:
+                return result
+            del self._recent[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._async_run(key, fetch))
+            self._in_flight[key] = task
+        # A cancelled caller must not cancel the request other callers share.
+        return await asyncio.shield(task)
+
+    async def _async_run(self, key: _RequestKey, fetch: Callable[[], Awaitable[CollectionDates]]) -> CollectionDates:
+        try:
+            result = await fetch()
+        finally:
+            self._in_flight.pop(key, None)
+
+        if self.freshness > 0:
+            completed_at = time.monotonic()
+            # Re-inserting keeps the dict in completion order, so results that
+            # went stale without being asked for again are dropped from the front.
+            self._recent.pop(key, None)
+            self._recent[key] = (completed_at, result)
+            while True:
+                oldest_key, (oldest_at, _result) = next(iter(self._recent.items()))
+                if completed_at - oldest_at < self.freshness:
+                    break
+                del self._recent[oldest_key]
+        return result
 
 class HccApiClient:
-    def __init__(self, session: aiohttp.ClientSession, api_url: str = API_BASE) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        api_url: str = API_BASE,
+        coalescer: Optional[HccRequestCoalescer] = None,
+        breaker: Optional[HccCircuitBreaker] = None,
+        scheduler: Optional[HccFetchScheduler] = None,
+        response_cache: Optional[OrderedDict[_RequestKey, _CachedResponse]] = None,
+        profiler: Optional[HccProfiler] = None,
+    ) -> None:
         self._session = session
         self._api_url = api_url
+        self._host = urlsplit(api_url).netloc.lower() or api_url
+        self._scheduler = scheduler
+        self._coalescer = coalescer
+        self._breaker = breaker if breaker is not None else HccCircuitBreaker()
+        self.metrics = HccFetchMetrics()
+        self.profiler = profiler
+        # Validators and freshness of the last response per (api_url, address)
+        self._cache: OrderedDict[_RequestKey, _CachedResponse] = (
+            response_cache if response_cache is not None else OrderedDict()
+        )
 
+    @profiled("fetch")
     async def fetch_collection_dates(self, address: str, timeout_sec: int = 10) -> Tuple[Optional[dt_date], Optional[dt_date]]:
         """
         Calls the API and returns (red_date, yellow_date) as date objects (no time).
         """
+        if self._coalescer is None:
+            return await self._fetch(address, timeout_sec)
+
+        key = (self._api_url, canonical_address(address))
+        return await self._coalescer.async_fetch(key, lambda: self._fetch(address, timeout_sec))
+
+    @property
+    def breaker_state(self) -> str:
+        return self._breaker.state
+
+    def set_api_url(self, api_url: str, breaker: Optional[HccCircuitBreaker] = None) -> bool:
+        """Point the client at another API; return False if it already uses it."""
+        if api_url == self._api_url:
+            return False
+        self._api_url = api_url
+        self._host = urlsplit(api_url).netloc.lower() or api_url
+        self._breaker = breaker if breaker is not None else HccCircuitBreaker()
+        return True
+
+    async def _fetch(self, address: str, timeout_sec: int) -> Tuple[Optional[dt_date], Optional[dt_date]]:
+        cache_key = (self._api_url, canonical_address(address))
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached.expires_at:
+            self.metrics.cache_hits += 1
+            return cached.result
+
+        attempt = 0
+        while True:
+            self._breaker.before_request()
+            try:
+                if self._scheduler is None:
+                    result = await self._request(address, cache_key, cached, timeout_sec)
+                else:
+                    result = await self._scheduler.async_run(
+                        self._host, lambda: self._request(address, cache_key, cached, timeout_sec)
+                    )
+            except asyncio.CancelledError:
+                self._breaker.release()
+                raise
+            except Exception as ex:
+                if not _is_retryable(ex):
+                    # The host answered; a bad payload says nothing about its health.
+                    self._breaker.record_success()
+                    raise
+                self._breaker.record_failure()
+                attempt += 1
+                if attempt >= RETRY_ATTEMPTS or self._breaker.state == BREAKER_OPEN:
+                    raise
+                # Full jitter keeps entries that failed together from retrying together.
+                delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(0, delay))
+                self.metrics.retries += 1
+            else:
+                self._breaker.record_success()
+                return result
+
+    async def _request(
+        self,
+        address: str,
+        cache_key: _RequestKey,
+        cached: Optional[_CachedResponse],
+        timeout_sec: int,
+    ) -> Tuple[Optional[dt_date], Optional[dt_date]]:
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
         params = {"address_string": address}
+        metrics = self.metrics
+        metrics.requests += 1
+        started = time.perf_counter()
         try:
-            async with self._session.get(self._api_url, params=params, timeout=timeout_sec) as resp:
+            async with self._session.get(self._api_url, params=params, headers=headers, timeout=timeout_sec) as resp:
+                metrics.ttfb_ms.add((time.perf_counter() - started) * 1000)
+                max_age = _parse_max_age(resp.headers.get("Cache-Control"))
+                if resp.status == 304 and cached is not None:
+                    # Unchanged: skip JSON decoding and date parsing entirely.
+                    metrics.latency_ms.add((time.perf_counter() - started) * 1000)
+                    metrics.not_modified += 1
+                    if max_age is None:
+                        self._cache.pop(cache_key, None)
+                    else:
+                        cached.expires_at = time.monotonic() + max_age
+                    return cached.result
                 resp.raise_for_status()
-                data = await resp.json(content_type=None)
+                body = await resp.read()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
         except asyncio.TimeoutError as ex:
             raise ex
         except aiohttp.ClientError as ex:
             raise ex
 
+        metrics.latency_ms.add((time.perf_counter() - started) * 1000)
+        metrics.body_bytes.add(len(body))
+
+        result = self._parse(body)
+
+        self._cache.pop(cache_key, None)
+        if max_age is not None and (etag or last_modified or max_age > 0):
+            self._cache[cache_key] = _CachedResponse(
+                result, etag, last_modified, time.monotonic() + max_age
+            )
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    @profiled("fetch.parse")
+    def _parse(self, body: bytes) -> Tuple[Optional[dt_date], Optional[dt_date]]:
+        metrics = self.metrics
+        received = time.perf_counter()
+        data = json.loads(body)
+        decoded = time.perf_counter()
+        metrics.json_decode_ms.add((decoded - received) * 1000)
+
         if not isinstance(data, list) or not data or not isinstance(data[0], dict):
             raise ValueError("Unexpected JSON shape")
 
@@ -43,4 +334,31 @@ class HccApiClient:
 
         red_date = parse_date(red_raw)
         yellow_date = parse_date(yellow_raw)
-        return red_date, yellow_date
\ No newline at end of file
+        metrics.date_parse_ms.add((time.perf_counter() - decoded) * 1000)
+        return red_date, yellow_date
+
+def get_circuit_breaker(hass: HomeAssistant, api_url: str) -> HccCircuitBreaker:
+    """Return the breaker shared by every client of the API host."""
+    breakers: Dict[str, HccCircuitBreaker] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_BREAKERS, {})
+    host = urlsplit(api_url).netloc.lower() or api_url
+    if (breaker := breakers.get(host)) is None:
+        breaker = breakers[host] = HccCircuitBreaker()
+    return breaker
+
+def create_api_client(
+    hass: HomeAssistant, api_url: str = API_BASE, profiler: Optional[HccProfiler] = None
+) -> HccApiClient:
+    """Build a client wired to the domain-wide shared request state."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (coalescer := domain_data.get(DATA_COALESCER)) is None:
+        coalescer = domain_data[DATA_COALESCER] = HccRequestCoalescer()
+    response_cache = domain_data.setdefault(DATA_RESPONSE_CACHE, OrderedDict())
+    return HccApiClient(
+        async_get_clientsession(hass),
+        api_url=api_url,
+        coalescer=coalescer,
+        breaker=get_circuit_breaker(hass, api_url),
+        scheduler=get_fetch_scheduler(hass),
+        response_cache=response_cache,
+        profiler=profiler,
+    )
@@ -6,25 +6,25 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_ADDRESS, sanitize_address
-from .coordinator import HccCoordinator
+from .const import DOMAIN, canonical_address, sanitize_address
+from .coordinator import HccCoordinator, entry_coordinators
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    coordinator: HccCoordinator = hass.data[DOMAIN][entry.entry_id]
-    address = entry.data[CONF_ADDRESS]
-    
-    async_add_entities([HccRefreshButton(coordinator, address)])
+    async_add_entities(
+        [HccRefreshButton(coordinator, coordinator.address) for coordinator in entry_coordinators(hass, entry)]
+    )
 
 class HccRefreshButton(CoordinatorEntity[HccCoordinator], ButtonEntity):
     _attr_has_entity_name = True
     _attr_name = "Refresh Collection Data"
 
     def __init__(self, coordinator: HccCoordinator, address: str) -> None:
-        super().__init__(coordinator)
+        # Nothing to render from the data, so never ask to be notified.
+        super().__init__(coordinator, context=frozenset())
         self._address = address
         
         sanitized = sanitize_address(address)
@@ -33,11 +33,11 @@ class HccRefreshButton(CoordinatorEntity[HccCoordinator], ButtonEntity):
         self.entity_id = f"button.{base_id}"
         
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"addr:{address.lower()}")},
+            "identifiers": {(DOMAIN, f"addr:{canonical_address(address)}")},
             "name": f"HCC Bin ({address})",
             "manufacturer": "Hamilton City Council",
             "model": "FightTheLandFill",
         }
 
     async def async_press(self) -> None:
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        await self.coordinator.async_request_fetch()
\ No newline at end of file
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, date as dt_date
+from typing import Optional
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, canonical_address, sanitize_address
+from .coordinator import HccCoordinator, entry_coordinators
+from .forecast import BINS
+from .window import WINDOW_TASKS, compute_window
+
+TASK_SUMMARIES = {"out": "Put out {bin} bin", "in": "Bring in {bin} bin"}
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    async_add_entities(
+        [HccCollectionCalendar(coordinator, coordinator.address) for coordinator in entry_coordinators(hass, entry)]
+    )
+
+class HccEventIndex:
+    """
+    Events sorted by start, with their UTC bounds in parallel lists.
+
+    A range query bisects the starts: only events starting before the range
+    ends and no earlier than the longest event before the range begins can
+    overlap it.
+    """
+
+    def __init__(self, events: list[CalendarEvent]) -> None:
+        bounds = sorted(
+            ((_as_utc(event.start), _as_utc(event.end), event) for event in events),
+            key=lambda item: item[0],
+        )
+        self._starts = [start for start, _end, _event in bounds]
+        self._ends = [end for _start, end, _event in bounds]
+        self._events = [event for _start, _end, event in bounds]
+        self._max_duration = max((end - start for start, end, _event in bounds), default=timedelta(0))
+
+    def between(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        lo = bisect_left(self._starts, start - self._max_duration)
+        hi = bisect_left(self._starts, end)
+        return [self._events[i] for i in range(lo, hi) if self._ends[i] > start]
+
+    def current_or_next(self, now: datetime) -> Optional[CalendarEvent]:
+        """The earliest-starting event in progress, else the next one to start."""
+        lo = bisect_left(self._starts, now - self._max_duration)
+        hi = bisect_right(self._starts, now)
+        for i in range(lo, hi):
+            if self._ends[i] > now:
+                return self._events[i]
+        return self._events[hi] if hi < len(self._events) else None
+
+def _as_utc(value: datetime | dt_date) -> datetime:
+    # All-day events span their local day.
+    if isinstance(value, datetime):
+        return dt_util.as_utc(value)
+    return dt_util.as_utc(dt_util.start_of_local_day(value))
+
+class HccCollectionCalendar(CoordinatorEntity[HccCoordinator], CalendarEntity):
+    """Collection days and put-out/bring-in windows, including forecast collections."""
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: HccCoordinator, address: str) -> None:
+        super().__init__(coordinator, context=frozenset({"red", "yellow"}))
+        self._address = address
+        self._attr_has_entity_name = False
+        self._attr_name = "HCC Bin Collections"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, f"addr:{canonical_address(address)}")},
+            "name": f"HCC Bin ({address})",
+            "manufacturer": "Hamilton City Council",
+            "model": "FightTheLandFill",
+        }
+
+        sanitized = sanitize_address(address)
+        base_id = f"hcc_bin_{sanitized}_collections"
+        self._attr_unique_id = base_id
+        self.entity_id = f"calendar.{base_id}"
+
+        self._index = HccEventIndex([])
+        self._index_key: Optional[tuple] = None
+        self._unsub_windows = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._unsub_windows = self.coordinator.windows.async_add_listener(self._handle_windows_update)
+        self._async_rebuild()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._unsub_windows:
+            self._unsub_windows()
+            self._unsub_windows = None
+        await super().async_will_remove_from_hass()
+
+    @property
+    def event(self) -> Optional[CalendarEvent]:
+        return self._index.current_or_next(dt_util.utcnow())
+
+    async def async_get_events(self, hass: HomeAssistant, start_date: datetime, end_date: datetime) -> list[CalendarEvent]:
+        return self._index.between(start_date, end_date)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._async_rebuild()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _handle_windows_update(self) -> None:
+        # Window transitions notify too; only new hours change the index.
+        if self._async_rebuild():
+            self.async_write_ha_state()
+
+    @callback
+    def _async_rebuild(self) -> bool:
+        """Rebuild the index when its inputs changed; return whether it did."""
+        data = self.coordinator.data
+        forecast = self.coordinator.forecast
+        hours = self.coordinator.windows.hours
+        dates: dict[str, tuple[dt_date, ...]] = {}
+        for bin_color in BINS:
+            fetched = getattr(data, bin_color) if data else None
+            upcoming = set(forecast.forecast(bin_color, fetched)) if fetched else set()
+            if fetched:
+                upcoming.add(fetched)
+            dates[bin_color] = tuple(sorted(upcoming))
+
+        key = (dates["red"], dates["yellow"], tuple(hours.items()))
+        if key == self._index_key:
+            return False
+        self._index_key = key
+
+        events: list[CalendarEvent] = []
+        for bin_color, collection_dates in dates.items():
+            for collection_date in collection_dates:
+                events.append(
+                    CalendarEvent(
+                        start=collection_date,
+                        end=collection_date + timedelta(days=1),
+                        summary=f"{bin_color.capitalize()} bin collection",
+                    )
+                )
+
+        for task_key, bin_color, task_type, _pre_key, _post_key in WINDOW_TASKS:
+            if task_key not in hours:
+                continue
+            for collection_date in dates[bin_color]:
+                window = compute_window(collection_date, task_type, *hours[task_key])
+                events.append(
+                    CalendarEvent(
+                        start=dt_util.as_local(window.start),
+                        end=dt_util.as_local(window.end),
+                        summary=TASK_SUMMARIES[task_type].format(bin=bin_color.capitalize()),
+                    )
+                )
+
+        self._index = HccEventIndex(events)
+        return True
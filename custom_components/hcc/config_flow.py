@@ -1,59 +1,185 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+import asyncio
+import logging
+import time
 
 import voluptuous as vol
 import aiohttp
 
 from homeassistant import config_entries
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
 
 from .const import (
     DOMAIN,
     CONF_ADDRESS,
     CONF_UPDATE_MINUTES,
     CONF_API_URL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADDRESSES,
+    CONF_PROFILING,
+    CONF_PROFILE_BUDGET_MS,
+    CONF_WINDOW_PROFILE,
+    CONF_WINDOW_HOURS,
     DEFAULT_UPDATE_MINUTES,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_PROFILING,
+    DEFAULT_PROFILE_BUDGET_MS,
     MIN_UPDATE_MINUTES,
     MAX_UPDATE_MINUTES,
+    MIN_PROFILE_BUDGET_MS,
+    MAX_PROFILE_BUDGET_MS,
     API_BASE,
+    DATA_VALIDATION,
+    IMPORT_VALIDATION_CONCURRENCY,
+    VALIDATION_CACHE_TTL_SECONDS,
+    VALIDATION_NEGATIVE_TTL_SECONDS,
+    canonical_address,
 )
-from .api import HccApiClient
+from .api import create_api_client
+from .coordinator import entry_coordinators
+from .window import DEFAULT_WINDOW_HOURS, WINDOW_HOURS_SCHEMA, WINDOW_TASKS, HccWindowProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+@dataclass(slots=True)
+class _ValidationResult:
+    error: Optional[str]
+    expires_at: float
+
+class HccValidationCache:
+    """
+    Recent validation outcomes per (api_url, address), shared by all flows.
+
+    Valid addresses are remembered for `ttl` seconds and invalid ones for
+    `negative_ttl`; `import_limit` bounds how many imports validate at once.
+    """
+
+    def __init__(
+        self,
+        ttl: float = VALIDATION_CACHE_TTL_SECONDS,
+        negative_ttl: float = VALIDATION_NEGATIVE_TTL_SECONDS,
+        import_concurrency: int = IMPORT_VALIDATION_CONCURRENCY,
+    ) -> None:
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._results: Dict[Tuple[str, str], _ValidationResult] = {}
+        self.import_limit = asyncio.Semaphore(import_concurrency)
+
+    def get(self, key: Tuple[str, str]) -> Optional[_ValidationResult]:
+        result = self._results.get(key)
+        if result is not None and time.monotonic() >= result.expires_at:
+            del self._results[key]
+            return None
+        return result
+
+    def set(self, key: Tuple[str, str], error: Optional[str]) -> None:
+        ttl = self._ttl if error is None else self._negative_ttl
+        if ttl > 0:
+            self._results[key] = _ValidationResult(error, time.monotonic() + ttl)
+
+def hub_unique_id(name: Optional[str]) -> str:
+    """A hub is identified by its YAML name, so editing its address list keeps the entry."""
+    return f"hcc_hub_{slugify(name)}" if name else "hcc_hub"
+
+def _get_validation_cache(hass: HomeAssistant) -> HccValidationCache:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (cache := domain_data.get(DATA_VALIDATION)) is None:
+        cache = domain_data[DATA_VALIDATION] = HccValidationCache()
+    return cache
 
 class HccConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
-    async def _validate_and_create(self, address: str, update_minutes: int | None, api_url: str = API_BASE):
-        session = async_get_clientsession(self.hass)
-        client = HccApiClient(session, api_url=api_url)
-
-        # Validate with one fetch
-        try:
-            await client.fetch_collection_dates(address)
-        except aiohttp.ClientError:
-            return None, {"base": "cannot_connect"}
-        except ValueError:
-            return None, {"base": "invalid_response"}
-        except Exception:
-            return None, {"base": "unknown"}
-
-        await self.async_set_unique_id(f"hcc_bin_{address.lower()}")
-        
+    async def _validate_and_create(
+        self,
+        address: str,
+        update_minutes: int | None,
+        api_url: str = API_BASE,
+        adaptive: bool | None = None,
+    ):
+        # Already configured addresses are settled without contacting the API.
+        unique_id = f"hcc_bin_{canonical_address(address)}"
+        self._async_migrate_legacy_unique_id(address, unique_id)
+        await self.async_set_unique_id(unique_id)
+        # A hub address has the same entities; a second entry for it would collide.
+        if canonical_address(address) in self._async_hub_addresses():
+            return None, {"base": "address_in_hub"}
+
         # Determine data for entry
         data = {CONF_ADDRESS: address}
         if update_minutes is not None:
             data[CONF_UPDATE_MINUTES] = update_minutes
         if api_url != API_BASE:
             data[CONF_API_URL] = api_url
+        if adaptive is not None:
+            data[CONF_ADAPTIVE_POLLING] = adaptive
 
-        # Abort if it exists, BUT update the config if parameters changed (like api_url)
-        self._abort_if_unique_id_configured(updates=data)
+        # Abort if it exists, BUT update the config if parameters changed (like api_url).
+        # The entry's update listener applies the change in place, so no reload.
+        self._abort_if_unique_id_configured(updates=data, reload_on_update=False)
+
+        if (error := await self._async_validate(address, api_url)) is not None:
+            return None, {"base": error}
 
         return self.async_create_entry(
             title=f"HCC Bin: {address}",
             data=data,
         ), None
 
+    def _async_migrate_legacy_unique_id(self, address: str, unique_id: str) -> None:
+        """Move an entry keyed by the old lower-cased address onto its canonical unique id."""
+        entries = self._async_current_entries(include_ignore=False)
+        if any(entry.unique_id == unique_id for entry in entries):
+            return
+        canonical = canonical_address(address)
+        for entry in entries:
+            legacy = entry.data.get(CONF_ADDRESS)
+            if legacy and entry.unique_id == f"hcc_bin_{legacy.lower()}" and canonical_address(legacy) == canonical:
+                self.hass.config_entries.async_update_entry(entry, unique_id=unique_id)
+                return
+
+    def _async_hub_addresses(self) -> set[str]:
+        """Canonical addresses of every hub entry."""
+        return {
+            canonical_address(address)
+            for entry in self._async_current_entries(include_ignore=False)
+            for address in entry.data.get(CONF_ADDRESSES, ())
+        }
+
+    async def _async_validate(self, address: str, api_url: str) -> Optional[str]:
+        """Validate with one fetch, or a recent result; return an error key or None."""
+        cache = _get_validation_cache(self.hass)
+        key = (api_url, canonical_address(address))
+        is_import = self.source == config_entries.SOURCE_IMPORT
+
+        # A person retrying in the UI gets a fresh attempt after a failure.
+        if (cached := cache.get(key)) is not None and (cached.error is None or is_import):
+            return cached.error
+
+        async with cache.import_limit if is_import else nullcontext():
+            if is_import and (cached := cache.get(key)) is not None:
+                return cached.error
+
+            client = create_api_client(self.hass, api_url)
+            try:
+                await client.fetch_collection_dates(address)
+                error = None
+            except aiohttp.ClientError:
+                error = "cannot_connect"
+            except ValueError:
+                error = "invalid_response"
+            except Exception:
+                error = "unknown"
+
+        cache.set(key, error)
+        return error
+
     async def async_step_user(self, user_input: Dict[str, Any] | None = None):
         errors: Dict[str, str] = {}
         if user_input is not None:
@@ -67,23 +193,76 @@ class HccConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
     async def async_step_import(self, user_input: Dict[str, Any]):
+        if CONF_ADDRESSES in user_input:
+            return await self._async_import_hub(user_input)
+
         address = user_input[CONF_ADDRESS].strip()
         minutes = int(user_input.get(CONF_UPDATE_MINUTES, DEFAULT_UPDATE_MINUTES))
         api_url = user_input.get(CONF_API_URL, API_BASE) # <-- Read from import
+        adaptive = user_input.get(CONF_ADAPTIVE_POLLING)
 
         if minutes < MIN_UPDATE_MINUTES or minutes > MAX_UPDATE_MINUTES:
             minutes = DEFAULT_UPDATE_MINUTES
 
-        entry, errors = await self._validate_and_create(address, minutes, api_url)
+        entry, errors = await self._validate_and_create(address, minutes, api_url, adaptive)
         if errors is None:
             return entry
         return self.async_abort(reason=next(iter(errors.values()), "unknown"))
 
+    async def _async_import_hub(self, user_input: Dict[str, Any]):
+        """One entry polling a list of addresses, identified by its name."""
+        # Addresses with an entry of their own stay there; their entities would collide.
+        standalone = {
+            canonical_address(entry.data[CONF_ADDRESS])
+            for entry in self._async_current_entries(include_ignore=False)
+            if CONF_ADDRESS in entry.data
+        }
+        # One address per canonical form; the first spelling wins.
+        by_canonical: Dict[str, str] = {}
+        for address in user_input[CONF_ADDRESSES]:
+            if not (canonical := canonical_address(address)):
+                continue
+            if canonical in standalone:
+                _LOGGER.warning("Hub address %s already has its own entry; not adding it to the hub", address)
+                continue
+            by_canonical.setdefault(canonical, address.strip())
+        addresses = list(by_canonical.values())
+        if not addresses:
+            return self.async_abort(reason="no_addresses")
+        minutes = int(user_input.get(CONF_UPDATE_MINUTES, DEFAULT_UPDATE_MINUTES))
+        api_url = user_input.get(CONF_API_URL, API_BASE)
+        name = user_input.get(CONF_NAME)
+
+        if minutes < MIN_UPDATE_MINUTES or minutes > MAX_UPDATE_MINUTES:
+            minutes = DEFAULT_UPDATE_MINUTES
+
+        unique_id = hub_unique_id(name)
+        await self.async_set_unique_id(unique_id)
+
+        data: Dict[str, Any] = {CONF_ADDRESSES: addresses, CONF_UPDATE_MINUTES: minutes}
+        if api_url != API_BASE:
+            data[CONF_API_URL] = api_url
+        if name:
+            data[CONF_NAME] = name
+        # An edited address list lands in the existing entry, whose update listener reloads it.
+        self._abort_if_unique_id_configured(updates=data, reload_on_update=False)
+
+        errors = await asyncio.gather(*(self._async_validate(address, api_url) for address in addresses))
+        if (error := next((e for e in errors if e), None)) is not None:
+            return self.async_abort(reason=error)
+
+        return self.async_create_entry(
+            title=f"HCC Bin Hub: {name}" if name else "HCC Bin Hub",
+            data=data,
+        )
+
     @staticmethod
     @config_entries.HANDLERS.register(DOMAIN)
     class OptionsFlow(config_entries.OptionsFlow):
         def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
             self.config_entry = config_entry
+            # Settings from the first step, while the window hours step is shown
+            self._options: Dict[str, Any] = {}
 
         async def async_step_init(self, user_input: Dict[str, Any] | None = None):
             return await self.async_step_user()
@@ -95,14 +274,74 @@ class HccConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_UPDATE_MINUTES,
                 self.config_entry.data.get(CONF_UPDATE_MINUTES, DEFAULT_UPDATE_MINUTES),
             )
+            current_adaptive = self.config_entry.options.get(
+                CONF_ADAPTIVE_POLLING,
+                self.config_entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            )
+            current_profiling = self.config_entry.options.get(CONF_PROFILING, DEFAULT_PROFILING)
+            current_budget = self.config_entry.options.get(CONF_PROFILE_BUDGET_MS, DEFAULT_PROFILE_BUDGET_MS)
+            current_window_profile = self.config_entry.options.get(CONF_WINDOW_PROFILE, False)
+            # Hubs poll on their own timer; adaptive polling does not apply to them.
+            is_hub = CONF_ADDRESSES in self.config_entry.data
             if user_input is not None:
                 minutes = int(user_input.get(CONF_UPDATE_MINUTES, current))
+                adaptive = bool(user_input.get(CONF_ADAPTIVE_POLLING, current_adaptive))
+                profiling = bool(user_input.get(CONF_PROFILING, current_profiling))
+                budget = int(user_input.get(CONF_PROFILE_BUDGET_MS, current_budget))
                 if minutes < MIN_UPDATE_MINUTES or minutes > MAX_UPDATE_MINUTES:
                     errors["base"] = "bad_interval"
+                elif budget < MIN_PROFILE_BUDGET_MS or budget > MAX_PROFILE_BUDGET_MS:
+                    errors["base"] = "bad_budget"
                 else:
-                    return self.async_create_entry(title="", data={CONF_UPDATE_MINUTES: minutes})
+                    self._options = {
+                        CONF_UPDATE_MINUTES: minutes,
+                        CONF_PROFILING: profiling,
+                        CONF_PROFILE_BUDGET_MS: budget,
+                        CONF_WINDOW_PROFILE: bool(user_input.get(CONF_WINDOW_PROFILE, current_window_profile)),
+                    }
+                    if not is_hub:
+                        self._options[CONF_ADAPTIVE_POLLING] = adaptive
+                    # Profile hours are kept while the profile is off, for when it is turned back on.
+                    if CONF_WINDOW_HOURS in self.config_entry.options:
+                        self._options[CONF_WINDOW_HOURS] = self.config_entry.options[CONF_WINDOW_HOURS]
+                    if self._options[CONF_WINDOW_PROFILE]:
+                        return await self.async_step_window_hours()
+                    return self.async_create_entry(title="", data=self._options)
 
-            schema = vol.Schema(
-                {vol.Required(CONF_UPDATE_MINUTES, default=current): vol.Coerce(int)}
-            )
-            return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
\ No newline at end of file
+            fields: Dict[Any, Any] = {vol.Required(CONF_UPDATE_MINUTES, default=current): vol.Coerce(int)}
+            if not is_hub:
+                fields[vol.Required(CONF_ADAPTIVE_POLLING, default=current_adaptive)] = bool
+            fields[vol.Required(CONF_PROFILING, default=current_profiling)] = bool
+            fields[vol.Required(CONF_PROFILE_BUDGET_MS, default=current_budget)] = vol.Coerce(int)
+            fields[vol.Required(CONF_WINDOW_PROFILE, default=current_window_profile)] = bool
+            schema = vol.Schema(fields)
+            return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+        async def async_step_window_hours(self, user_input: Dict[str, Any] | None = None):
+            """Pre/post hours of each task, stored as the entry's window profile."""
+            if user_input is not None:
+                profile = HccWindowProfile.from_options({
+                    task_key: {"pre": user_input[pre_key], "post": user_input[post_key]}
+                    for task_key, _bin, _type, pre_key, post_key in WINDOW_TASKS
+                })
+                return self.async_create_entry(
+                    title="", data={**self._options, CONF_WINDOW_HOURS: profile.as_options()}
+                )
+
+            current = self._current_window_hours()
+            fields: Dict[Any, Any] = {}
+            for task_key, _bin, _type, pre_key, post_key in WINDOW_TASKS:
+                pre, post = current[task_key]
+                fields[vol.Required(pre_key, default=pre)] = WINDOW_HOURS_SCHEMA
+                fields[vol.Required(post_key, default=post)] = WINDOW_HOURS_SCHEMA
+            return self.async_show_form(step_id="window_hours", data_schema=vol.Schema(fields))
+
+        def _current_window_hours(self) -> Mapping[str, Tuple[float, float]]:
+            """Stored profile hours, else the hours the entry's numbers give now."""
+            if CONF_WINDOW_HOURS in self.config_entry.options:
+                return HccWindowProfile.from_options(self.config_entry.options[CONF_WINDOW_HOURS]).hours
+            if self.config_entry.entry_id in self.hass.data.get(DOMAIN, {}):
+                hours = entry_coordinators(self.hass, self.config_entry)[0].windows.hours
+                if len(hours) == len(WINDOW_TASKS):
+                    return hours
+            return DEFAULT_WINDOW_HOURS
\ No newline at end of file
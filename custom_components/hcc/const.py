@@ -1,3 +1,4 @@
+from functools import lru_cache
 import re
 
 DOMAIN = "hcc"
@@ -5,21 +6,126 @@ DOMAIN = "hcc"
 CONF_ADDRESS = "address_string"
 CONF_UPDATE_MINUTES = "update_minutes"
 CONF_API_URL = "api_url"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_ADDRESSES = "addresses"
+CONF_PROFILING = "profiling"
+CONF_PROFILE_BUDGET_MS = "profile_budget_ms"
+# Window profile mode: window hours kept in the options, no hour number entities
+CONF_WINDOW_PROFILE = "window_profile"
+CONF_WINDOW_HOURS = "window_hours"
 
 DEFAULT_UPDATE_MINUTES = 60
 MIN_UPDATE_MINUTES = 5
 MAX_UPDATE_MINUTES = 1440
 
+# Adaptive polling: sparse while both dates are ahead, a few hourly polls
+# right after a collection day rolls over (ending as soon as the API moves
+# the date on), and a backoff from the configured interval while the API is
+# failing.
+DEFAULT_ADAPTIVE_POLLING = False
+ADAPTIVE_SPARSE_MAX_MINUTES = 1440
+ADAPTIVE_BURST_MINUTES = 60
+ADAPTIVE_BURST_HOURS = 4
+ADAPTIVE_BACKOFF_MAX_MINUTES = 240
+
+# Hub entries: addresses of one hub fetched at once per cycle
+HUB_FETCH_CONCURRENCY = 4
+
+# Recurrence forecasting: collection dates remembered per bin, forecast
+# length, the periods tried (longest first) and the slack allowed for
+# holiday shifts. With adaptive polling a confirmed forecast is trusted until
+# FORECAST_CONFIRM_DAYS before the earliest its next collection's put-out
+# window could open (see forecast.CONFIRM_LEAD).
+FORECAST_HISTORY_SIZE = 12
+FORECAST_COUNT = 6
+RECURRENCE_PERIODS_DAYS = (14, 7)
+RECURRENCE_TOLERANCE_DAYS = 1
+FORECAST_CONFIRM_DAYS = 1
+
+# Config flow validation: imports validated at once, and how long a valid
+# (or, for imports, invalid) address is remembered
+IMPORT_VALIDATION_CONCURRENCY = 4
+VALIDATION_CACHE_TTL_SECONDS = 3600
+VALIDATION_NEGATIVE_TTL_SECONDS = 300
+
 API_BASE = "https://api.hcc.govt.nz/FightTheLandFill/get_Collection_Dates"
 
+# Identical requests completed this recently are served from memory
+COALESCE_FRESHNESS_SECONDS = 30
+
+# Addresses whose HTTP validators (ETag/Last-Modified) and results are kept,
+# shared by every entry so duplicate addresses reuse one response
+RESPONSE_CACHE_SIZE = 512
+
+# Retries per fetch (attempts include the first request), full-jitter backoff
+RETRY_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 10.0
+
+# Circuit breaker shared by all entries on the same API host
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 300
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Shared fetch scheduler: global request rate, per-host concurrency and the
+# window over which entries' first fetches are spread after startup
+FETCH_RATE_PER_SECOND = 2.0
+FETCH_BURST = 5
+FETCH_MAX_CONCURRENCY_PER_HOST = 4
+FETCH_STAGGER_MAX_MINUTES = 15
+
+# hcc.refresh service: an address refreshed this recently (or still being
+# refreshed) is not fetched again; its result is reused
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+REFRESH_DEBOUNCE_SECONDS = 30
+
+# Samples kept per fetch metric for the rolling percentiles
+METRICS_WINDOW = 100
+
+# Optional profiling of callbacks, coordinator updates and fetches: a single
+# event-loop call over the budget is logged (at most once a minute per
+# section) and fires an event. Per-minute totals and the slowest calls of
+# each section are kept for diagnostics.
+DEFAULT_PROFILING = False
+DEFAULT_PROFILE_BUDGET_MS = 10
+MIN_PROFILE_BUDGET_MS = 1
+MAX_PROFILE_BUDGET_MS = 1000
+PROFILE_MINUTES = 60
+PROFILE_SLOWEST = 5
+EVENT_PROFILE_BUDGET = "hcc_profile_budget_exceeded"
+
 # Status text constants
 STATUS_SUCCESS = "success"
 STATUS_NETWORK = "network_error"
 STATUS_JSON = "json_parsing"
 STATUS_UNEXPECTED = "unexpected_error"
 
-PLATFORMS = ["sensor", "binary_sensor", "number", "button", "switch"]
+# Domain-wide objects kept in hass.data[DOMAIN] next to the per-entry coordinators
+DATA_SNAPSHOTS = "snapshots"
+DATA_COALESCER = "coalescer"
+DATA_RESPONSE_CACHE = "response_cache"
+DATA_BREAKERS = "breakers"
+DATA_FETCH_SCHEDULER = "fetch_scheduler"
+DATA_VALIDATION = "validation"
+# Window profiles just turned off, per entry id, for the recreated hour numbers to start from
+DATA_WINDOW_SEEDS = "window_seeds"
+
+PLATFORMS = ["sensor", "binary_sensor", "number", "button", "switch", "calendar"]
+
+@lru_cache(maxsize=1024)
+def canonical_address(address: str) -> str:
+    """
+    Case, punctuation and spacing insensitive form of an address.
+
+    Addresses with the same canonical form are the same address: they share a
+    unique id, an entity id slug and one upstream request.
+    """
+    return " ".join(re.findall(r'[a-z0-9]+', address.lower()))
 
+@lru_cache(maxsize=1024)
 def sanitize_address(address: str) -> str:
     """Sanitize the address string to be safe for entity IDs."""
-    return re.sub(r'[^a-z0-9]+', '_', address.lower()).strip('_')
\ No newline at end of file
+    return canonical_address(address).replace(" ", "_")
\ No newline at end of file
@@ -1,51 +1,373 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field, fields, replace
 from datetime import timedelta, datetime, timezone, date as dt_date
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, TYPE_CHECKING
+import asyncio
 import logging
 
 import aiohttp
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from .api import HccApiClient
-from .const import DOMAIN, STATUS_SUCCESS, STATUS_NETWORK, STATUS_JSON, STATUS_UNEXPECTED, API_BASE
+from .forecast import BINS, HccForecaster
+from .window import HccWindowModel, HccWindowProfile
+from .const import (
+    DOMAIN,
+    STATUS_SUCCESS,
+    STATUS_NETWORK,
+    STATUS_JSON,
+    STATUS_UNEXPECTED,
+    ADAPTIVE_SPARSE_MAX_MINUTES,
+    ADAPTIVE_BURST_MINUTES,
+    ADAPTIVE_BURST_HOURS,
+    ADAPTIVE_BACKOFF_MAX_MINUTES,
+    HUB_FETCH_CONCURRENCY,
+    canonical_address,
+    sanitize_address,
+)
+from .entity_index import HccEntityIndex
+from .profiler import HccProfiler, profiled
+from .state_writer import HccStateWriter
+
+if TYPE_CHECKING:
+    from .store import HccSnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass(frozen=True, slots=True)
 class HccData:
-    def __init__(self) -> None:
-        self.red: Optional[dt_date] = None
-        self.yellow: Optional[dt_date] = None
-        self.last_success_fetch: Optional[datetime] = None
-        self.last_status_ok: bool = False
-        self.last_status_text: str = STATUS_UNEXPECTED
+    """
+    Immutable snapshot of one address's fetch state.
+
+    Every fetch attempt produces a new snapshot with a higher version. The
+    version is excluded from equality, so two snapshots compare equal when
+    nothing an entity could display has changed.
+    """
+
+    red: Optional[dt_date] = None
+    yellow: Optional[dt_date] = None
+    last_success_fetch: Optional[datetime] = None
+    last_status_ok: bool = False
+    last_status_text: str = STATUS_UNEXPECTED
+    version: int = field(default=0, compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "red": self.red.isoformat() if self.red else None,
+            "yellow": self.yellow.isoformat() if self.yellow else None,
+            "last_success_fetch": self.last_success_fetch.isoformat() if self.last_success_fetch else None,
+            "last_status_ok": self.last_status_ok,
+            "last_status_text": self.last_status_text,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> HccData:
+        last_success_fetch = raw.get("last_success_fetch")
+        return cls(
+            red=dt_date.fromisoformat(raw["red"]) if raw.get("red") else None,
+            yellow=dt_date.fromisoformat(raw["yellow"]) if raw.get("yellow") else None,
+            last_success_fetch=datetime.fromisoformat(last_success_fetch) if last_success_fetch else None,
+            last_status_ok=bool(raw.get("last_status_ok", False)),
+            last_status_text=raw.get("last_status_text", STATUS_UNEXPECTED),
+        )
+
+HCC_DATA_FIELDS = frozenset(f.name for f in fields(HccData))
+
+# Listener context for the shared circuit breaker, which is not part of HccData
+BREAKER_STATE = "breaker_state"
+
+def changed_fields(old: Optional[HccData], new: HccData) -> frozenset[str]:
+    """Names of the HccData fields (including version) that differ between two snapshots."""
+    if old is None:
+        return HCC_DATA_FIELDS
+    return frozenset(name for name in HCC_DATA_FIELDS if getattr(old, name) != getattr(new, name))
+
+def compute_adaptive_interval(data: HccData, now: datetime, failures: int, fallback: timedelta) -> timedelta:
+    """
+    Derive the next refresh delay from the fetched dates.
+
+    The API only moves a date on once its collection day is over, so there is
+    nothing new to learn until the earliest date rolls over at the following
+    local midnight.
+    """
+    if failures:
+        # Never faster than the fixed interval adaptive polling replaces.
+        backoff = fallback * 2 ** min(failures - 1, 16)
+        return min(backoff, max(fallback, timedelta(minutes=ADAPTIVE_BACKOFF_MAX_MINUTES)))
+
+    dates = [d for d in (data.red, data.yellow) if d]
+    if not dates:
+        return fallback
+
+    burst = timedelta(minutes=ADAPTIVE_BURST_MINUTES)
+    rollover = dt_util.start_of_local_day(min(dates) + timedelta(days=1))
+    if now >= rollover:
+        # Upstream has not published the next date yet; poll a few times, then
+        # give up and fall back to the configured interval. A fetch that moves
+        # the date on moves the rollover too, which ends the burst.
+        if now - rollover < timedelta(hours=ADAPTIVE_BURST_HOURS):
+            return burst
+        return fallback
+
+    return max(min(rollover - now, timedelta(minutes=ADAPTIVE_SPARSE_MAX_MINUTES)), burst)
 
 class HccCoordinator(DataUpdateCoordinator[HccData]):
     # Add api_url argument
-    def __init__(self, hass: HomeAssistant, address: str, update_interval: timedelta, session: aiohttp.ClientSession, api_url: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        update_interval: Optional[timedelta],
+        client: HccApiClient,
+        adaptive: bool = False,
+        snapshots: Optional[HccSnapshotStore] = None,
+        forecast_history: Optional[dict[str, Any]] = None,
+        snapshot_key: Optional[str] = None,
+        window_profile: Optional[HccWindowProfile] = None,
+    ) -> None:
         super().__init__(hass, _LOGGER, name="HCC Bin Coordinator", update_interval=update_interval)
         self._address = address
-        # Pass api_url to the client
-        self._client = HccApiClient(session, api_url=api_url)
+        self._fixed_interval = update_interval
+        self._adaptive = adaptive
+        self._failures = 0
+        self._snapshots = snapshots
+        self._snapshot_key = snapshot_key
+        self.canonical_address = canonical_address(address)
+        self.slug = sanitize_address(address)
+        self._client = client
+        self.metrics = client.metrics
+        self.profiler = client.profiler
         self.data = HccData()
+        # Snapshot and success flag the listeners were last notified about
+        self._notified_data: Optional[HccData] = None
+        self._notified_success: Optional[bool] = None
+        self._notified_breaker: Optional[str] = None
+        self.entity_index = HccEntityIndex(hass, self.slug)
+        self.windows = HccWindowModel(hass, self, self.entity_index, window_profile)
+        self.state_writer = HccStateWriter(hass)
+        self.forecast = HccForecaster(forecast_history)
+        self._fetch_requested = False
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    @property
+    def client(self) -> HccApiClient:
+        return self._client
+
+    @callback
+    def async_apply_settings(self, update_interval: timedelta, adaptive: bool) -> None:
+        """Apply changed polling options to the running coordinator and reschedule."""
+        if update_interval == self._fixed_interval and adaptive == self._adaptive:
+            return
+        self._fixed_interval = update_interval
+        self._adaptive = adaptive
+        if adaptive:
+            self.update_interval = compute_adaptive_interval(
+                self.data, dt_util.now(), self._failures, update_interval
+            )
+        else:
+            self.update_interval = update_interval
+        # The next poll moves to one new interval from now; nothing is fetched early.
+        if self._listeners:
+            self._schedule_refresh()
+
+    @property
+    def breaker_state(self) -> str:
+        """State of the circuit breaker shared by all entries on this API host."""
+        return self._client.breaker_state
+
+    @callback
+    @profiled("coordinator.notify")
+    def async_update_listeners(self) -> None:
+        """
+        Notify only the listeners whose context names a field that changed.
+
+        Entities pass the HccData fields they render as their coordinator
+        context, plus BREAKER_STATE for the circuit breaker; a context of
+        None means "always notify".
+        """
+        changed = changed_fields(self._notified_data, self.data)
+        # The breaker moves with fetches of any entry on the host, not with the data.
+        if (breaker_state := self.breaker_state) != self._notified_breaker:
+            changed |= {BREAKER_STATE}
+        success_changed = self._notified_success != self.last_update_success
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+        self._notified_breaker = breaker_state
+
+        # Windows are derived from the dates, so refresh them before entities read them.
+        if changed & {"red", "yellow"}:
+            self.windows.async_recompute()
 
+        for update_callback, context in list(self._listeners.values()):
+            if success_changed or context is None or changed & context:
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        self.windows.async_shutdown()
+        self.entity_index.async_shutdown()
+        self.state_writer.async_shutdown()
+        await super().async_shutdown()
+
+    async def async_request_fetch(self) -> None:
+        """Request a refresh that always contacts the API, even while the forecast is trusted."""
+        self._fetch_requested = True
+        await self.async_request_refresh()
+
+    async def async_fetch_now(self) -> None:
+        """Fetch from the API right away, bypassing the debouncer, and publish the result."""
+        self._fetch_requested = True
+        await self.async_refresh()
+
+    def _project_forecast(self, previous: HccData, now: datetime) -> Optional[HccData]:
+        """
+        The last snapshot rolled forward by the forecast, or None once any
+        bin's next collection is due for confirmation by a real fetch.
+        """
+        if not previous.last_status_ok or not previous.last_success_fetch:
+            return None
+        known = [d for d in (previous.red, previous.yellow) if d]
+        if known and now >= dt_util.start_of_local_day(min(known) + timedelta(days=1)):
+            # A collection day is over: fetch, bursting until the API moves on.
+            return None
+        today = now.date()
+        fetched_on = dt_util.as_local(previous.last_success_fetch).date()
+        dates: dict[str, dt_date] = {}
+        for bin_color in BINS:
+            confirm_by = self.forecast.confirm_by(bin_color, today)
+            if confirm_by is None or (today >= confirm_by and fetched_on < confirm_by):
+                return None
+            dates[bin_color] = self.forecast.project(bin_color, today)
+        return replace(previous, **dates)
+
+    async def async_fetch(self) -> HccData:
+        """Produce the next snapshot without publishing it; used by the hub's batch."""
+        return await self._async_update_data()
+
+    @profiled("coordinator.update")
     async def _async_update_data(self) -> HccData:
+        previous = self.data
+        now = dt_util.now()
+        fetch_requested, self._fetch_requested = self._fetch_requested, False
+        if (
+            self._adaptive
+            and not fetch_requested
+            and (projected := self._project_forecast(previous, now)) is not None
+        ):
+            # The forecast is confirmed for the upcoming collections; no fetch needed.
+            self.update_interval = compute_adaptive_interval(projected, now, 0, self._fixed_interval)
+            return projected
+
+        red_date, yellow_date = previous.red, previous.yellow
+        last_success_fetch = previous.last_success_fetch
         try:
             red_date, yellow_date = await self._client.fetch_collection_dates(self._address)
-            self.data.red = red_date
-            self.data.yellow = yellow_date
-            self.data.last_success_fetch = datetime.now(timezone.utc)
-            self.data.last_status_ok = True
-            self.data.last_status_text = STATUS_SUCCESS
+            last_success_fetch = datetime.now(timezone.utc)
+            status = STATUS_SUCCESS
         except aiohttp.ClientError:
-            self.data.last_status_ok = False
-            self.data.last_status_text = STATUS_NETWORK
+            status = STATUS_NETWORK
         except ValueError:
-            self.data.last_status_ok = False
-            self.data.last_status_text = STATUS_JSON
+            status = STATUS_JSON
         except Exception:
-            self.data.last_status_ok = False
-            self.data.last_status_text = STATUS_UNEXPECTED
+            status = STATUS_UNEXPECTED
+
+        data = HccData(
+            red=red_date,
+            yellow=yellow_date,
+            last_success_fetch=last_success_fetch,
+            last_status_ok=status == STATUS_SUCCESS,
+            last_status_text=status,
+            version=previous.version + 1,
+        )
+
+        if data.last_status_ok:
+            self._failures = 0
+            for bin_color in BINS:
+                collection_date = getattr(data, bin_color)
+                if collection_date and self.forecast.observe(bin_color, collection_date):
+                    _LOGGER.debug("Forecast for the %s bin missed: API returned %s", bin_color, collection_date)
+            snapshot_key = self._snapshot_key or (self.config_entry and self.config_entry.entry_id)
+            if self._snapshots and snapshot_key:
+                self._snapshots.async_save(snapshot_key, data, self.forecast.as_dict())
+        else:
+            self._failures += 1
+            self.metrics.record_error(status)
+
+        if self._adaptive:
+            self.update_interval = compute_adaptive_interval(
+                data, now, self._failures, self._fixed_interval
+            )
+
+        return data
+
+class HccHubCoordinator(DataUpdateCoordinator[Mapping[str, HccData]]):
+    """
+    Polls every address of a hub entry in one batch per cycle.
+
+    Each address keeps an HccCoordinator without a timer of its own; its
+    entities are unchanged. The hub fetches them with bounded concurrency,
+    keeps the results keyed by address, and hands each one to its address.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_interval: timedelta,
+        children: Mapping[str, HccCoordinator],
+        concurrency: int = HUB_FETCH_CONCURRENCY,
+        profiler: Optional[HccProfiler] = None,
+    ) -> None:
+        super().__init__(hass, _LOGGER, name="HCC Bin Hub Coordinator", update_interval=update_interval)
+        self.children = MappingProxyType(dict(children))
+        self._concurrency = concurrency
+        self.profiler = profiler
+        self.data = MappingProxyType({address: child.data for address, child in self.children.items()})
+
+    @callback
+    def async_apply_settings(self, update_interval: timedelta) -> None:
+        """Apply a changed interval to the running hub and reschedule."""
+        if update_interval == self.update_interval:
+            return
+        self.update_interval = update_interval
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    @profiled("hub.push")
+    def async_push_to_children(self) -> None:
+        """Publish each address's latest snapshot to its own coordinator."""
+        for address, child in self.children.items():
+            data = self.data.get(address)
+            if data is not None and data is not child.data:
+                child.async_set_updated_data(data)
+
+    async def async_shutdown(self) -> None:
+        for child in self.children.values():
+            await child.async_shutdown()
+        await super().async_shutdown()
+
+    @profiled("hub.update")
+    async def _async_update_data(self) -> Mapping[str, HccData]:
+        limit = asyncio.Semaphore(self._concurrency)
+
+        async def _async_fetch(child: HccCoordinator) -> HccData:
+            async with limit:
+                return await child.async_fetch()
+
+        # Children never raise; failures are recorded in their snapshots.
+        results = await asyncio.gather(*(_async_fetch(child) for child in self.children.values()))
+        return MappingProxyType(dict(zip(self.children, results)))
 
-        return self.data
\ No newline at end of file
+def entry_coordinators(hass: HomeAssistant, entry: ConfigEntry) -> list[HccCoordinator]:
+    """The per-address coordinators of an entry: one, or one per hub address."""
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(runtime, HccHubCoordinator):
+        return list(runtime.children.values())
+    return [runtime]
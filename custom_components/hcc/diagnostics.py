@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_ADDRESS, CONF_ADDRESSES
+from .coordinator import HccCoordinator, HccHubCoordinator
+from .forecast import BINS
+from .profiler import HccProfiler
+
+# The unique id embeds the canonical address, and a hub's name often names its street.
+TO_REDACT = {CONF_ADDRESS, CONF_ADDRESSES, CONF_NAME, "title", "unique_id"}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(runtime, HccHubCoordinator):
+        interval = runtime.update_interval
+        return {
+            "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+            "update_interval_seconds": interval.total_seconds() if interval else None,
+            "last_update_success": runtime.last_update_success,
+            "profiling": _profiler_diagnostics(runtime.profiler),
+            # Listed in configuration order; addresses are redacted.
+            "addresses": [
+                async_redact_data(_coordinator_diagnostics(child), TO_REDACT) for child in runtime.children.values()
+            ],
+        }
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        **async_redact_data(_coordinator_diagnostics(runtime), TO_REDACT),
+        "profiling": _profiler_diagnostics(runtime.profiler),
+    }
+
+def _profiler_diagnostics(profiler: Optional[HccProfiler]) -> Optional[dict[str, Any]]:
+    # One profiler per entry, shared by a hub's addresses.
+    return profiler.as_dict() if profiler is not None else None
+
+def _coordinator_diagnostics(coordinator: HccCoordinator) -> dict[str, Any]:
+    interval = coordinator.update_interval
+    return {
+        "data": coordinator.data.as_dict(),
+        "update_interval_seconds": interval.total_seconds() if interval else None,
+        "last_update_success": coordinator.last_update_success,
+        "circuit_breaker": coordinator.breaker_state,
+        "metrics": coordinator.metrics.as_dict(),
+        "forecast": {
+            "history": coordinator.forecast.as_dict(),
+            "periods": {bin_color: coordinator.forecast.period(bin_color) for bin_color in BINS},
+            "mismatches": coordinator.forecast.mismatches,
+        },
+    }
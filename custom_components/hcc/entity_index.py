@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+
+from .const import DOMAIN
+from .window import WINDOW_TASKS
+
+def _indexed_keys() -> list[tuple[str, str]]:
+    keys: list[tuple[str, str]] = []
+    for task_key, _bin, _type, pre_key, post_key in WINDOW_TASKS:
+        keys.append(("number", pre_key))
+        keys.append(("number", post_key))
+        keys.append(("switch", f"{task_key}_complete"))
+    return keys
+
+INDEXED_KEYS = _indexed_keys()
+
+class HccEntityIndex:
+    """
+    Resolved entity ids of the number and switch entities of one address,
+    keyed by (platform, key). Built once and refreshed on entity registry
+    updates, so callbacks never touch the registry themselves.
+
+    Entities of the address that siblings read directly (the task switches)
+    also register themselves here while added, so their in-memory state can
+    be read before it reaches the state machine.
+    """
+
+    def __init__(self, hass: HomeAssistant, slug: str) -> None:
+        self._hass = hass
+        self._slug = slug
+        self._prefixes = tuple(f"{platform}.hcc_bin_{slug}_" for platform in ("number", "switch"))
+        self._entity_ids: Mapping[tuple[str, str], str] = MappingProxyType({})
+        self._entities: dict[tuple[str, str], Entity] = {}
+        self._listeners: dict[CALLBACK_TYPE, CALLBACK_TYPE] = {}
+        self._unsub_registry: Optional[CALLBACK_TYPE] = None
+
+    def get(self, platform: str, key: str) -> Optional[str]:
+        return self._entity_ids.get((platform, key))
+
+    def get_entity(self, platform: str, key: str) -> Optional[Entity]:
+        return self._entities.get((platform, key))
+
+    @callback
+    def async_register_entity(self, platform: str, key: str, entity: Entity) -> CALLBACK_TYPE:
+        """Make entity readable through get_entity until the returned callback is called."""
+        self._entities[(platform, key)] = entity
+
+        @callback
+        def unregister() -> None:
+            if self._entities.get((platform, key)) is entity:
+                del self._entities[(platform, key)]
+
+        return unregister
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever a resolved entity id changes."""
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener, None)
+
+        self._listeners[remove_listener] = update_callback
+        return remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        self._async_rebuild()
+        self._unsub_registry = self._hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_registry_update
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._unsub_registry:
+            self._unsub_registry()
+            self._unsub_registry = None
+        self._listeners.clear()
+        self._entities.clear()
+
+    @callback
+    def _async_rebuild(self) -> bool:
+        registry = er.async_get(self._hass)
+        entity_ids: dict[tuple[str, str], str] = {}
+        for platform, key in INDEXED_KEYS:
+            if eid := registry.async_get_entity_id(platform, DOMAIN, f"hcc_bin_{self._slug}_{key}"):
+                entity_ids[(platform, key)] = eid
+
+        if entity_ids == self._entity_ids:
+            return False
+        self._entity_ids = MappingProxyType(entity_ids)
+        return True
+
+    @callback
+    def _handle_registry_update(self, event: Event) -> None:
+        known = self._entity_ids.values()
+        for entity_id in (event.data.get("entity_id"), event.data.get("old_entity_id")):
+            if entity_id and (entity_id in known or entity_id.startswith(self._prefixes)):
+                break
+        else:
+            return
+
+        if self._async_rebuild():
+            for update_callback in list(self._listeners.values()):
+                update_callback()
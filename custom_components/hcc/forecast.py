@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import timedelta, date as dt_date
+from typing import Any, Optional, Sequence
+import math
+
+from .const import (
+    FORECAST_HISTORY_SIZE,
+    FORECAST_COUNT,
+    FORECAST_CONFIRM_DAYS,
+    RECURRENCE_PERIODS_DAYS,
+    RECURRENCE_TOLERANCE_DAYS,
+)
+from .window import MAX_WINDOW_HOURS
+
+BINS = ("red", "yellow")
+
+# A forecast collection is confirmed this long before it: early enough for a
+# holiday moving it forward and for the longest put-out window, plus the
+# confirmation margin for a poll late in the day.
+CONFIRM_LEAD = timedelta(
+    days=FORECAST_CONFIRM_DAYS + RECURRENCE_TOLERANCE_DAYS + math.ceil(MAX_WINDOW_HOURS / 24)
+)
+
+def fits_period(gap: int, period: int) -> bool:
+    """Whether a gap in days is a whole number of periods, give or take a holiday shift."""
+    cycles = round(gap / period)
+    return cycles >= 1 and abs(gap - cycles * period) <= RECURRENCE_TOLERANCE_DAYS
+
+def infer_period(history: Sequence[dt_date]) -> Optional[int]:
+    """
+    Return the collection period in days that explains every gap in history.
+
+    Gaps may skip collections (a missed fetch) and may be off by a day or so
+    (public holidays); the longest period that fits all gaps wins.
+    """
+    gaps = [(later - earlier).days for earlier, later in zip(history, history[1:])]
+    if not gaps:
+        return None
+    for period in RECURRENCE_PERIODS_DAYS:
+        if all(fits_period(gap, period) for gap in gaps):
+            return period
+    return None
+
+class HccForecaster:
+    """
+    Learns each bin's recurrence from the dates the API has returned and
+    projects the next collections from the last confirmed one.
+    """
+
+    def __init__(self, history: Optional[dict[str, Any]] = None) -> None:
+        self._history: dict[str, list[dt_date]] = {bin_color: [] for bin_color in BINS}
+        self._periods: dict[str, Optional[int]] = {bin_color: None for bin_color in BINS}
+        self.mismatches = 0
+        for bin_color, raw_dates in (history or {}).items():
+            if bin_color not in self._history:
+                continue
+            try:
+                dates = sorted({dt_date.fromisoformat(raw) for raw in raw_dates})
+            except (TypeError, ValueError):
+                continue
+            self._history[bin_color] = dates[-FORECAST_HISTORY_SIZE:]
+        self._infer()
+
+    def as_dict(self) -> dict[str, list[str]]:
+        return {bin_color: [d.isoformat() for d in dates] for bin_color, dates in self._history.items()}
+
+    def period(self, bin_color: str) -> Optional[int]:
+        return self._periods[bin_color]
+
+    def observe(self, bin_color: str, collection_date: dt_date) -> bool:
+        """Record a date confirmed by the API; return True if the forecast had it wrong."""
+        history = self._history[bin_color]
+        if history and collection_date <= history[-1]:
+            return False
+
+        # Missed fetches skip whole cycles and holidays shift a day, as in
+        # inference; only a date neither explains is a miss.
+        period = self._periods[bin_color]
+        mismatch = (
+            bool(history)
+            and period is not None
+            and not fits_period((collection_date - history[-1]).days, period)
+        )
+        if mismatch:
+            self.mismatches += 1
+
+        history.append(collection_date)
+        del history[:-FORECAST_HISTORY_SIZE]
+        self._infer()
+        return mismatch
+
+    def forecast(self, bin_color: str, today: dt_date, count: int = FORECAST_COUNT) -> list[dt_date]:
+        """Next `count` collections on or after today; empty until a period is known."""
+        history = self._history[bin_color]
+        period = self._periods[bin_color]
+        if not history or period is None:
+            return []
+        last = history[-1]
+        skip = max(0, -(-(today - last).days // period))
+        return [last + timedelta(days=period * (skip + k)) for k in range(count)]
+
+    def project(self, bin_color: str, today: dt_date) -> Optional[dt_date]:
+        dates = self.forecast(bin_color, today, 1)
+        return dates[0] if dates else None
+
+    def confirm_by(self, bin_color: str, today: dt_date) -> Optional[dt_date]:
+        """Day from which the next forecast collection must be confirmed by a fetch."""
+        projected = self.project(bin_color, today)
+        return None if projected is None else projected - CONFIRM_LEAD
+
+    def _infer(self) -> None:
+        for bin_color, history in self._history.items():
+            self._periods[bin_color] = infer_period(history)
+
+        # Hamilton alternates the bins week by week on a fortnightly cycle, so
+        # one date per bin a week apart already gives both periods.
+        red, yellow = self._history["red"], self._history["yellow"]
+        if red and yellow and abs((red[-1] - yellow[-1]).days) % 14 == 7:
+            for bin_color in BINS:
+                if len(self._history[bin_color]) < 2:
+                    self._periods[bin_color] = 14
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections import deque
+import math
+from typing import Any, Optional
+
+from .const import METRICS_WINDOW, STATUS_NETWORK, STATUS_JSON, STATUS_UNEXPECTED
+
+class HccRollingStat:
+    """The last `size` samples of one measurement, with nearest-rank percentiles."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.last: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.last = value
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = math.ceil(q / 100 * len(ordered))
+        return ordered[max(0, min(len(ordered), rank) - 1)]
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": len(self._samples),
+            "last": _round(self.last),
+            "p50": _round(self.percentile(50)),
+            "p95": _round(self.percentile(95)),
+            "p99": _round(self.percentile(99)),
+        }
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+class HccFetchMetrics:
+    """Timings and counters of one client's fetch pipeline."""
+
+    def __init__(self) -> None:
+        self.latency_ms = HccRollingStat()
+        self.ttfb_ms = HccRollingStat()
+        self.body_bytes = HccRollingStat()
+        self.json_decode_ms = HccRollingStat()
+        self.date_parse_ms = HccRollingStat()
+        self.requests = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.cache_hits = 0
+        self.errors: dict[str, int] = {STATUS_NETWORK: 0, STATUS_JSON: 0, STATUS_UNEXPECTED: 0}
+
+    def record_error(self, status: str) -> None:
+        self.errors[status] = self.errors.get(status, 0) + 1
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms.summary(),
+            "ttfb_ms": self.ttfb_ms.summary(),
+            "body_bytes": self.body_bytes.summary(),
+            "json_decode_ms": self.json_decode_ms.summary(),
+            "date_parse_ms": self.date_parse_ms.summary(),
+            "requests": self.requests,
+            "retries": self.retries,
+            "not_modified": self.not_modified,
+            "cache_hits": self.cache_hits,
+            "errors": dict(self.errors),
+        }
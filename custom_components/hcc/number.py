@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 
-from .const import DOMAIN, CONF_ADDRESS, sanitize_address
+from .const import DOMAIN, DATA_WINDOW_SEEDS, canonical_address, sanitize_address
+from .coordinator import entry_coordinators
 
 # Define the configuration structure for our 8 numbers
 NUMBER_TYPES = [
@@ -25,12 +29,23 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback
 ) -> None:
-    address = entry.data[CONF_ADDRESS]
     entities = []
-    
-    for key, name, default_val in NUMBER_TYPES:
-        entities.append(HccWindowNumber(address, key, name, default_val))
-        
+    registry = er.async_get(hass)
+    # Set when the window profile was just turned off: its hours replace the restored states.
+    seed = hass.data[DOMAIN].get(DATA_WINDOW_SEEDS, {}).pop(entry.entry_id, None)
+    seed_hours = seed.as_numbers() if seed is not None else {}
+
+    for coordinator in entry_coordinators(hass, entry):
+        if coordinator.windows.profile is not None:
+            # Window profile mode: hours live in the options. Drop numbers left
+            # from before so they do not linger as unavailable states.
+            for key, _name, _default_val in NUMBER_TYPES:
+                if entity_id := registry.async_get_entity_id("number", DOMAIN, f"hcc_bin_{coordinator.slug}_{key}"):
+                    registry.async_remove(entity_id)
+            continue
+        for key, name, default_val in NUMBER_TYPES:
+            entities.append(HccWindowNumber(coordinator.address, key, name, default_val, seed_hours.get(key)))
+
     async_add_entities(entities)
 
 class HccWindowNumber(RestoreEntity, NumberEntity):
@@ -41,11 +56,14 @@ class HccWindowNumber(RestoreEntity, NumberEntity):
     _attr_native_step = 0.5
     _attr_native_unit_of_measurement = "h"
 
-    def __init__(self, address: str, key: str, name: str, default_val: float) -> None:
+    def __init__(
+        self, address: str, key: str, name: str, default_val: float, seed: Optional[float] = None
+    ) -> None:
         self._address = address
         self._key = key
         self._attr_name = name
         self._default_val = default_val
+        self._seed = seed
         
         sanitized = sanitize_address(address)
         base_id = f"hcc_bin_{sanitized}_{key}"
@@ -53,7 +71,7 @@ class HccWindowNumber(RestoreEntity, NumberEntity):
         self.entity_id = f"number.{base_id}"
         
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"addr:{address.lower()}")},
+            "identifiers": {(DOMAIN, f"addr:{canonical_address(address)}")},
             "name": f"HCC Bin ({address})",
             "manufacturer": "Hamilton City Council",
             "model": "FightTheLandFill",
@@ -63,6 +81,9 @@ class HccWindowNumber(RestoreEntity, NumberEntity):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        if self._seed is not None:
+            self._attr_native_value = self._seed
+            return
         if (last_state := await self.async_get_last_state()) is not None:
             if last_state.state not in ("unknown", "unavailable"):
                 try:
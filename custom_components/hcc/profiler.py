@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections import deque
+from functools import wraps
+from operator import attrgetter
+from typing import Any, Callable, Optional
+import asyncio
+import heapq
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_PROFILE_BUDGET_MS,
+    EVENT_PROFILE_BUDGET,
+    PROFILE_MINUTES,
+    PROFILE_SLOWEST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+class HccSectionProfile:
+    """Call count, total time and the slowest calls of one profiled section."""
+
+    def __init__(self, blocking: bool) -> None:
+        self.blocking = blocking
+        self.calls = 0
+        self.total_ms = 0.0
+        self.over_budget = 0
+        # Min-heap of (ms, unix time), so the fastest of the kept calls goes first
+        self._slowest: list[tuple[float, float]] = []
+
+    def add(self, ms: float, at: float) -> None:
+        self.calls += 1
+        self.total_ms += ms
+        if len(self._slowest) < PROFILE_SLOWEST:
+            heapq.heappush(self._slowest, (ms, at))
+        elif ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (ms, at))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "blocking": self.blocking,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else None,
+            "over_budget": self.over_budget,
+            "slowest": [
+                {"ms": round(ms, 3), "at": dt_util.utc_from_timestamp(at).isoformat()}
+                for ms, at in sorted(self._slowest, reverse=True)
+            ],
+        }
+
+class HccProfiler:
+    """
+    Opt-in timing of one config entry's work.
+
+    Blocking sections (callbacks run on the event loop) count towards the
+    per-minute totals and are checked against the budget. Coroutine sections
+    are timed wall clock, awaits included, and only reported.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        enabled: bool = False,
+        budget_ms: float = DEFAULT_PROFILE_BUDGET_MS,
+    ) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self._sections: dict[str, HccSectionProfile] = {}
+        # (minute since the epoch, blocking ms in it), newest last
+        self._minutes: deque[tuple[int, float]] = deque(maxlen=PROFILE_MINUTES)
+        self._warned: dict[str, int] = {}
+
+    def configure(self, enabled: bool, budget_ms: float) -> None:
+        if enabled and not self.enabled:
+            # Start from a clean slate rather than mixing in an earlier session.
+            self._sections.clear()
+            self._minutes.clear()
+            self._warned.clear()
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+
+    def record(self, section: str, seconds: float, blocking: bool) -> None:
+        ms = seconds * 1000
+        now = time.time()
+        if (profile := self._sections.get(section)) is None:
+            profile = self._sections[section] = HccSectionProfile(blocking)
+        profile.add(ms, now)
+        if not blocking:
+            return
+
+        minute = int(now // 60)
+        if self._minutes and self._minutes[-1][0] == minute:
+            self._minutes[-1] = (minute, self._minutes[-1][1] + ms)
+        else:
+            self._minutes.append((minute, ms))
+
+        if ms <= self.budget_ms:
+            return
+        profile.over_budget += 1
+        # One event and one warning per section and minute; over_budget keeps the full count.
+        if self._warned.get(section) == minute:
+            return
+        self._warned[section] = minute
+        self._hass.bus.async_fire(
+            EVENT_PROFILE_BUDGET,
+            {
+                "config_entry_id": self._entry_id,
+                "section": section,
+                "duration_ms": round(ms, 3),
+                "budget_ms": self.budget_ms,
+            },
+        )
+        _LOGGER.warning(
+            "%s took %.1f ms on the event loop (budget %s ms, entry %s)",
+            section, ms, self.budget_ms, self._entry_id,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "budget_ms": self.budget_ms,
+            "sections": {name: profile.as_dict() for name, profile in sorted(self._sections.items())},
+            "per_minute_ms": [
+                {"minute": dt_util.utc_from_timestamp(minute * 60).isoformat(), "ms": round(ms, 3)}
+                for minute, ms in self._minutes
+            ],
+        }
+
+def profiled(
+    section: str,
+    owner: Callable[[Any], Optional[HccProfiler]] = attrgetter("profiler"),
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Time the decorated method with its owner's profiler, when one is enabled.
+
+    owner maps the instance to its profiler; the default reads self.profiler.
+    Apply below @callback so the wrapper is what gets marked.
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                profiler = owner(self)
+                if profiler is None or not profiler.enabled:
+                    return await func(self, *args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    profiler.record(section, time.perf_counter() - started, blocking=False)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            profiler = owner(self)
+            if profiler is None or not profiler.enabled:
+                return func(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                profiler.record(section, time.perf_counter() - started, blocking=True)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import time
+import zlib
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    DATA_FETCH_SCHEDULER,
+    FETCH_RATE_PER_SECOND,
+    FETCH_BURST,
+    FETCH_MAX_CONCURRENCY_PER_HOST,
+    FETCH_STAGGER_MAX_MINUTES,
+)
+
+_T = TypeVar("_T")
+
+class HccFetchScheduler:
+    """
+    Domain-wide gate every upstream request passes through.
+
+    A global token bucket bounds the request rate across all config entries,
+    and a semaphore per API host bounds how many requests are in flight.
+    """
+
+    def __init__(
+        self,
+        rate: float = FETCH_RATE_PER_SECOND,
+        burst: int = FETCH_BURST,
+        max_concurrency: int = FETCH_MAX_CONCURRENCY_PER_HOST,
+        stagger: timedelta = timedelta(minutes=FETCH_STAGGER_MAX_MINUTES),
+    ) -> None:
+        self._rate = rate
+        self._stagger = stagger
+        self._burst = burst
+        self._max_concurrency = max_concurrency
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._token_lock = asyncio.Lock()
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    async def async_run(self, host: str, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Run one upstream request once a token and a slot for the host are free."""
+        if (limit := self._host_limits.get(host)) is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self._max_concurrency)
+        async with limit:
+            await self._async_take_token()
+            return await request()
+
+    async def _async_take_token(self) -> None:
+        # The lock queues waiters in order, so the bucket drains fairly.
+        async with self._token_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def stagger_delay(self, key: str, interval: Optional[timedelta]) -> float:
+        """
+        Deterministic offset in seconds for an entry's first scheduled fetch.
+
+        Entries keep the phase they start with, so spreading the first fetch
+        spreads every following interval boundary too.
+        """
+        window = self._stagger
+        if interval is not None:
+            window = min(window, interval)
+        return zlib.crc32(key.encode()) / 2**32 * window.total_seconds()
+
+def get_fetch_scheduler(hass: HomeAssistant) -> HccFetchScheduler:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(DATA_FETCH_SCHEDULER)) is None:
+        scheduler = domain_data[DATA_FETCH_SCHEDULER] = HccFetchScheduler()
+    return scheduler
@@ -4,34 +4,46 @@ from typing import Optional
 from datetime import date as dt_date, datetime
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_ADDRESS, sanitize_address
-from .coordinator import HccCoordinator, HccData
+from .const import DOMAIN, canonical_address, sanitize_address
+from .coordinator import BREAKER_STATE, HccCoordinator, HccData, entry_coordinators
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    coordinator: HccCoordinator = hass.data[DOMAIN][entry.entry_id]
-    address = entry.data[CONF_ADDRESS]
-    entities: list[SensorEntity] = [
+    entities: list[SensorEntity] = []
+    for coordinator in entry_coordinators(hass, entry):
+        entities.extend(_address_entities(coordinator, coordinator.address))
+    async_add_entities(entities)
+
+def _address_entities(coordinator: HccCoordinator, address: str) -> list[SensorEntity]:
+    return [
         HccDateSensor(coordinator, address, "HCC Red Bin Collection Date", "red", "red_bin_collection_date"),
         HccDateSensor(coordinator, address, "HCC Yellow Bin Collection Date", "yellow", "yellow_bin_collection_date"),
         HccTimestampSensor(coordinator, address, "HCC Bin Last Fetch Date", "last_fetch", "last_fetch_date"),
         HccStatusTextSensor(coordinator, address, "HCC Bin Fetch Status Text", "fetch_status_text"),
+        HccFetchMetricSensor(coordinator, address, "HCC Bin Fetch Latency", "latency_ms", "fetch_latency", "ms"),
+        HccFetchMetricSensor(coordinator, address, "HCC Bin Fetch Time To First Byte", "ttfb_ms", "fetch_ttfb", "ms"),
+        HccFetchMetricSensor(coordinator, address, "HCC Bin Fetch Body Size", "body_bytes", "fetch_body_size", "B"),
+        HccFetchMetricSensor(coordinator, address, "HCC Bin Fetch JSON Decode Time", "json_decode_ms", "fetch_json_decode_time", "ms"),
+        HccFetchMetricSensor(coordinator, address, "HCC Bin Fetch Date Parse Time", "date_parse_ms", "fetch_date_parse_time", "ms"),
+        HccFetchErrorsSensor(coordinator, address, "HCC Bin Fetch Errors", "fetch_errors"),
+        HccForecastMismatchSensor(coordinator, address, "HCC Bin Forecast Mismatches", "forecast_mismatches"),
     ]
-    async_add_entities(entities)
 
 class HccBaseEntity(CoordinatorEntity[HccCoordinator]):
     _attr_should_poll = False
 
-    def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str) -> None:
-        super().__init__(coordinator)
+    def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, depends_on: frozenset[str]) -> None:
+        # The HccData fields this entity renders; other changes are not written.
+        super().__init__(coordinator, context=depends_on)
         self._address = address
         self._attr_has_entity_name = False
         self._attr_name = name_exact
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"addr:{address.lower()}")},
+            "identifiers": {(DOMAIN, f"addr:{canonical_address(address)}")},
             "name": f"HCC Bin ({address})",
             "manufacturer": "Hamilton City Council",
             "model": "FightTheLandFill",
@@ -41,7 +53,7 @@ class HccDateSensor(HccBaseEntity, SensorEntity):
     _attr_device_class = "date"
 
     def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, key: str, postfix: str) -> None:
-        super().__init__(coordinator, address, name_exact)
+        super().__init__(coordinator, address, name_exact, frozenset({key}))
         self._key = key
         sanitized = sanitize_address(address)
         base_id = f"hcc_bin_{sanitized}_{postfix}"
@@ -57,11 +69,22 @@ class HccDateSensor(HccBaseEntity, SensorEntity):
             return data.yellow
         return None
 
+    @property
+    def extra_state_attributes(self):
+        forecast = self.coordinator.forecast
+        # From the fetched date, not today: the state is only rewritten when that date moves.
+        collection_date = self.native_value
+        upcoming = forecast.forecast(self._key, collection_date) if collection_date else []
+        return {
+            "forecast": [d.isoformat() for d in upcoming],
+            "recurrence_days": forecast.period(self._key),
+        }
+
 class HccTimestampSensor(HccBaseEntity, SensorEntity):
     _attr_device_class = "timestamp"
 
     def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, key: str, postfix: str) -> None:
-        super().__init__(coordinator, address, name_exact)
+        super().__init__(coordinator, address, name_exact, frozenset({"last_success_fetch"}))
         self._key = key
         sanitized = sanitize_address(address)
         base_id = f"hcc_bin_{sanitized}_{postfix}"
@@ -77,7 +100,7 @@ class HccTimestampSensor(HccBaseEntity, SensorEntity):
 
 class HccStatusTextSensor(HccBaseEntity, SensorEntity):
     def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, postfix: str) -> None:
-        super().__init__(coordinator, address, name_exact)
+        super().__init__(coordinator, address, name_exact, frozenset({"last_status_text", BREAKER_STATE}))
         sanitized = sanitize_address(address)
         base_id = f"hcc_bin_{sanitized}_{postfix}"
         self._attr_unique_id = base_id
@@ -85,4 +108,73 @@ class HccStatusTextSensor(HccBaseEntity, SensorEntity):
 
     @property
     def native_value(self) -> Optional[str]:
-        return self.coordinator.data.last_status_text
\ No newline at end of file
+        return self.coordinator.data.last_status_text
+
+    @property
+    def extra_state_attributes(self):
+        return {"circuit_breaker": self.coordinator.breaker_state}
+
+class HccFetchMetricSensor(HccBaseEntity, SensorEntity):
+    """Median of a rolling fetch measurement, with the tail percentiles as attributes."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = "measurement"
+
+    def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, stat: str, postfix: str, unit: str) -> None:
+        # Metrics move on every fetch attempt, which is exactly when the version does.
+        super().__init__(coordinator, address, name_exact, frozenset({"version"}))
+        self._stat = stat
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = "duration" if unit == "ms" else "data_size"
+        sanitized = sanitize_address(address)
+        base_id = f"hcc_bin_{sanitized}_{postfix}"
+        self._attr_unique_id = base_id
+        self.entity_id = f"sensor.{base_id}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        summary = getattr(self.coordinator.metrics, self._stat).summary()
+        return summary["p50"]
+
+    @property
+    def extra_state_attributes(self):
+        summary = getattr(self.coordinator.metrics, self._stat).summary()
+        return {key: summary[key] for key in ("p95", "p99", "count")}
+
+class HccFetchErrorsSensor(HccBaseEntity, SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = "total_increasing"
+
+    def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, postfix: str) -> None:
+        super().__init__(coordinator, address, name_exact, frozenset({"version"}))
+        sanitized = sanitize_address(address)
+        base_id = f"hcc_bin_{sanitized}_{postfix}"
+        self._attr_unique_id = base_id
+        self.entity_id = f"sensor.{base_id}"
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.metrics.error_count
+
+    @property
+    def extra_state_attributes(self):
+        metrics = self.coordinator.metrics
+        return {**metrics.errors, "requests": metrics.requests, "retries": metrics.retries}
+
+class HccForecastMismatchSensor(HccBaseEntity, SensorEntity):
+    """Collections the API placed somewhere other than the learned recurrence."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = "total_increasing"
+
+    def __init__(self, coordinator: HccCoordinator, address: str, name_exact: str, postfix: str) -> None:
+        # A mismatch can only be found when a fetched date moves on.
+        super().__init__(coordinator, address, name_exact, frozenset({"red", "yellow"}))
+        sanitized = sanitize_address(address)
+        base_id = f"hcc_bin_{sanitized}_{postfix}"
+        self._attr_unique_id = base_id
+        self.entity_id = f"sensor.{base_id}"
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.forecast.mismatches
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any
+import asyncio
+import time
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS,
+    SERVICE_REFRESH,
+    ATTR_CONFIG_ENTRY_ID,
+    REFRESH_DEBOUNCE_SECONDS,
+    canonical_address,
+)
+from .coordinator import HccCoordinator, entry_coordinators
+from .scheduler import get_fetch_scheduler
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_ADDRESS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+class HccRefreshService:
+    """
+    Refreshes many addresses in one call.
+
+    An address refreshed less than `debounce` seconds ago, or still being
+    refreshed for an earlier call, is not fetched again; the call waits for
+    and reports that refresh instead. At most as many addresses refresh at
+    once as the fetch scheduler lets run per host.
+    """
+
+    def __init__(self, hass: HomeAssistant, debounce: float = REFRESH_DEBOUNCE_SECONDS) -> None:
+        self._hass = hass
+        self._debounce = debounce
+        self._refreshes: dict[HccCoordinator, tuple[float, asyncio.Task[None]]] = {}
+        self._limit = asyncio.Semaphore(get_fetch_scheduler(hass).max_concurrency)
+
+    async def async_handle(self, call: ServiceCall) -> ServiceResponse:
+        targets = self._resolve_targets(call.data.get(ATTR_CONFIG_ENTRY_ID), call.data.get(CONF_ADDRESS))
+
+        now = time.monotonic()
+        # Forget settled refreshes, including those of unloaded entries.
+        self._refreshes = {
+            coordinator: recent
+            for coordinator, recent in self._refreshes.items()
+            if not recent[1].done() or now - recent[0] < self._debounce
+        }
+
+        tasks: list[asyncio.Task[None]] = []
+        coalesced: list[bool] = []
+        for _entry_id, coordinator in targets:
+            if (recent := self._refreshes.get(coordinator)) is not None:
+                tasks.append(recent[1])
+                coalesced.append(True)
+                continue
+            task = self._hass.async_create_task(self._async_refresh(coordinator))
+            self._refreshes[coordinator] = (now, task)
+            tasks.append(task)
+            coalesced.append(False)
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        results: dict[str, Any] = {}
+        for (entry_id, coordinator), was_coalesced in zip(targets, coalesced):
+            data = coordinator.data
+            # Keyed like the addresses themselves: one result per address however it is spelled.
+            results[coordinator.canonical_address] = {
+                "address": coordinator.address,
+                "config_entry_id": entry_id,
+                "status": data.last_status_text,
+                "red": data.red.isoformat() if data.red else None,
+                "yellow": data.yellow.isoformat() if data.yellow else None,
+                "coalesced": was_coalesced,
+            }
+        return {"results": results}
+
+    async def _async_refresh(self, coordinator: HccCoordinator) -> None:
+        async with self._limit:
+            await coordinator.async_fetch_now()
+
+    def _resolve_targets(
+        self, entry_ids: list[str] | None, addresses: list[str] | None
+    ) -> list[tuple[str, HccCoordinator]]:
+        loaded = [
+            entry
+            for entry in self._hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id in self._hass.data.get(DOMAIN, {})
+        ]
+        if entry_ids:
+            unknown = set(entry_ids) - {entry.entry_id for entry in loaded}
+            if unknown:
+                raise ServiceValidationError(f"Not a loaded HCC entry: {', '.join(sorted(unknown))}")
+            loaded = [entry for entry in loaded if entry.entry_id in entry_ids]
+
+        wanted = {canonical_address(address) for address in addresses} if addresses else None
+        targets = [
+            (entry.entry_id, coordinator)
+            for entry in loaded
+            for coordinator in entry_coordinators(self._hass, entry)
+            if wanted is None or coordinator.canonical_address in wanted
+        ]
+        if wanted is not None and not targets:
+            raise ServiceValidationError("No configured HCC address matches")
+        return targets
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    service = HccRefreshService(hass)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        service.async_handle,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
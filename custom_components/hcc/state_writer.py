@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+
+def _signature(entity: Entity) -> tuple[Any, bool, Any]:
+    return (entity.state, entity.available, entity.extra_state_attributes)
+
+class HccStateWriter:
+    """
+    Write-on-change state coalescing for one config entry.
+
+    Entities schedule a write instead of writing directly. All writes
+    scheduled during one loop iteration are flushed together on the next,
+    and an entity whose state, availability and attributes match what was
+    last written is skipped.
+
+    The flush runs as a task of hass, so hass.async_block_till_done() waits
+    for pending writes like it waits for any other state change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._pending: dict[Entity, None] = {}
+        self._written: dict[Entity, tuple[Any, bool, Any]] = {}
+        self._flush_task: Optional[asyncio.Task[None]] = None
+
+    @callback
+    def async_schedule(self, entity: Entity) -> None:
+        self._pending[entity] = None
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task(
+                self._async_flush(), "hcc state writer flush", eager_start=False
+            )
+
+    @callback
+    def async_write_now(self, entity: Entity) -> None:
+        """Write immediately (user actions), keeping the last-written record in sync."""
+        self._pending.pop(entity, None)
+        self._written[entity] = _signature(entity)
+        entity.async_write_ha_state()
+
+    @callback
+    def async_added(self, entity: Entity) -> None:
+        """
+        Record the state an entity was just added with: the platform writes
+        it once async_added_to_hass returns, so the flush must not repeat it.
+        """
+        self._pending.pop(entity, None)
+        self._written[entity] = _signature(entity)
+
+    @callback
+    def async_forget(self, entity: Entity) -> None:
+        self._pending.pop(entity, None)
+        self._written.pop(entity, None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._pending.clear()
+        self._written.clear()
+
+    async def _async_flush(self) -> None:
+        self._flush_task = None
+        pending, self._pending = self._pending, {}
+        for entity in pending:
+            if entity.hass is None:
+                continue
+            signature = _signature(entity)
+            if self._written.get(entity) == signature:
+                continue
+            self._written[entity] = signature
+            entity.async_write_ha_state()
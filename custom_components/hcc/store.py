@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, DATA_SNAPSHOTS, sanitize_address
+from .coordinator import HccData
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+SAVE_DELAY = 10
+
+class HccSnapshotStore:
+    """
+    Last good HccData of every config entry, kept in a single storage file
+    together with the collection history the forecaster learns from.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, dict[str, Any]]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots: Optional[dict[str, dict[str, Any]]] = None
+
+    async def async_load(self) -> None:
+        if self._snapshots is not None:
+            return
+        snapshots = await self._store.async_load()
+        if self._snapshots is None:
+            self._snapshots = snapshots if isinstance(snapshots, dict) else {}
+
+    def get(self, entry_id: str) -> Optional[HccData]:
+        raw = (self._snapshots or {}).get(entry_id)
+        if not raw:
+            return None
+        try:
+            return HccData.from_dict(raw)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def get_history(self, entry_id: str) -> Optional[dict[str, Any]]:
+        raw = (self._snapshots or {}).get(entry_id) or {}
+        history = raw.get("history")
+        return history if isinstance(history, dict) else None
+
+    @callback
+    def async_save(self, entry_id: str, data: HccData, history: Optional[dict[str, Any]] = None) -> None:
+        if self._snapshots is None:
+            return
+        raw = data.as_dict()
+        if history is not None:
+            raw["history"] = history
+        self._snapshots[entry_id] = raw
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget an entry's snapshot, or all of a hub entry's address snapshots."""
+        if not self._snapshots:
+            return
+        hub_prefix = f"{entry_id}:"
+        keys = [key for key in self._snapshots if key == entry_id or key.startswith(hub_prefix)]
+        for key in keys:
+            del self._snapshots[key]
+        if keys:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        return self._snapshots or {}
+
+def hub_snapshot_key(entry_id: str, address: str) -> str:
+    return f"{entry_id}:{sanitize_address(address)}"
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> HccSnapshotStore:
+    """Return the domain-wide snapshot store, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_SNAPSHOTS)) is None:
+        store = domain_data[DATA_SNAPSHOTS] = HccSnapshotStore(hass)
+    await store.async_load()
+    return store
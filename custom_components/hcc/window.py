@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo, date as dt_date
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+import voluptuous as vol
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time, async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .coordinator import HccCoordinator
+    from .entity_index import HccEntityIndex
+
+# Config: (Task-Key, BinColor, Type, Pre-Key, Post-Key)
+WINDOW_TASKS = [
+    ("red_bin_put_out", "red", "out", "red_bin_put_out_pre_hours", "red_bin_put_out_post_hours"),
+    ("red_bin_bring_in", "red", "in", "red_bin_bring_in_pre_hours", "red_bin_bring_in_post_hours"),
+    ("yellow_bin_put_out", "yellow", "out", "yellow_bin_put_out_pre_hours", "yellow_bin_put_out_post_hours"),
+    ("yellow_bin_bring_in", "yellow", "in", "yellow_bin_bring_in_pre_hours", "yellow_bin_bring_in_post_hours"),
+]
+
+DEFAULT_PRE_HOURS = 6.0
+DEFAULT_POST_HOURS = 8.0
+
+# (pre, post) hours per task a window profile starts from; the same values
+# the window hour numbers start from
+DEFAULT_WINDOW_HOURS = {
+    "red_bin_put_out": (6.0, 8.0),
+    "red_bin_bring_in": (4.0, 5.0),
+    "yellow_bin_put_out": (6.0, 8.0),
+    "yellow_bin_bring_in": (4.0, 5.0),
+}
+MAX_WINDOW_HOURS = 48.0
+
+WINDOW_HOURS_SCHEMA = vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_WINDOW_HOURS))
+WINDOW_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(task_key): {vol.Required("pre"): WINDOW_HOURS_SCHEMA, vol.Required("post"): WINDOW_HOURS_SCHEMA}
+        for task_key, *_rest in WINDOW_TASKS
+    }
+)
+
+# Windows include their end instant, so the "closed" transition fires just after it.
+TRANSITION_GRACE = timedelta(seconds=1)
+
+# Computed windows kept per (date, type, pre, post); a handful of dates are live at a time.
+WINDOW_TABLE_SIZE = 64
+
+@dataclass(frozen=True, slots=True)
+class HccWindow:
+    # Both bounds are UTC: aware datetimes sharing one zone compare by wall
+    # clock, which is ambiguous in the hour repeated when DST ends.
+    start: datetime
+    end: datetime
+
+    def contains(self, now: datetime) -> bool:
+        return self.start <= now <= self.end
+
+    def next_transition(self, now: datetime) -> Optional[datetime]:
+        """Return the next instant at which contains() changes, if any."""
+        if now < self.start:
+            return self.start
+        if now <= self.end:
+            return self.end + TRANSITION_GRACE
+        return None
+
+@dataclass(frozen=True, slots=True)
+class HccWindowProfile:
+    """(pre, post) hours of every task, kept in the entry options instead of number entities."""
+
+    hours: Mapping[str, tuple[float, float]]
+
+    @classmethod
+    def from_options(cls, raw: Optional[Mapping[str, Any]]) -> HccWindowProfile:
+        """Validate stored options; tasks missing from them get their default hours."""
+        validated = WINDOW_PROFILE_SCHEMA(dict(raw or {}))
+        return cls(MappingProxyType({
+            task_key: (
+                (validated[task_key]["pre"], validated[task_key]["post"])
+                if task_key in validated
+                else DEFAULT_WINDOW_HOURS[task_key]
+            )
+            for task_key, *_rest in WINDOW_TASKS
+        }))
+
+    def as_options(self) -> dict[str, dict[str, float]]:
+        return {task_key: {"pre": pre, "post": post} for task_key, (pre, post) in self.hours.items()}
+
+    def as_numbers(self) -> dict[str, float]:
+        """Hours keyed like the window hour number entities."""
+        numbers: dict[str, float] = {}
+        for task_key, _bin, _type, pre_key, post_key in WINDOW_TASKS:
+            numbers[pre_key], numbers[post_key] = self.hours[task_key]
+        return numbers
+
+def compute_window(collection_date: dt_date, task_type: str, pre_hours: float, post_hours: float) -> HccWindow:
+    """
+    Put-out windows are anchored on local midnight of the collection day,
+    bring-in windows on the following midnight.
+
+    Results come from a small table, so repeated recomputes with unchanged
+    dates and hours do no timezone work.
+    """
+    return _window_table(collection_date, task_type, pre_hours, post_hours, dt_util.DEFAULT_TIME_ZONE)
+
+@lru_cache(maxsize=WINDOW_TABLE_SIZE)
+def _window_table(
+    collection_date: dt_date, task_type: str, pre_hours: float, post_hours: float, time_zone: tzinfo
+) -> HccWindow:
+    # Offsets are wall-clock hours from local midnight ("8 hours after" is
+    # 08:00 even on a changeover day). Each bound gets the UTC offset in force
+    # at that wall time; a skipped time resolves past the gap, a repeated one
+    # to its first occurrence.
+    anchor_date = collection_date if task_type == "out" else collection_date + timedelta(days=1)
+    anchor = datetime.combine(anchor_date, datetime.min.time())
+    return HccWindow(
+        start=dt_util.as_utc((anchor - timedelta(hours=pre_hours)).replace(tzinfo=time_zone)),
+        end=dt_util.as_utc((anchor + timedelta(hours=post_hours)).replace(tzinfo=time_zone)),
+    )
+
+class HccWindowModel:
+    """
+    Per config entry window state shared by the task switches and binary sensors.
+
+    All four windows are computed once per change (new dates, new hours) and
+    published as immutable values. A single point-in-time timer re-evaluates
+    which windows are active at the next start/end transition.
+
+    Hours come from the window profile when the entry has one, else from the
+    window hour number entities.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: HccCoordinator,
+        index: HccEntityIndex,
+        profile: Optional[HccWindowProfile] = None,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._index = index
+        self.profile = profile
+        self.windows: Mapping[str, Optional[HccWindow]] = MappingProxyType({})
+        self.active: frozenset[str] = frozenset()
+        # (pre, post) hours per task, from the profile or as last read from the number entities
+        self.hours: Mapping[str, tuple[float, float]] = MappingProxyType({})
+        self._listeners: dict[CALLBACK_TYPE, CALLBACK_TYPE] = {}
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._armed_at: Optional[datetime] = None
+        self._unsub_hours: Optional[CALLBACK_TYPE] = None
+        self._unsub_index: Optional[CALLBACK_TYPE] = None
+
+    def get(self, task_key: str) -> Optional[HccWindow]:
+        return self.windows.get(task_key)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever windows are recomputed outside a coordinator update."""
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener, None)
+
+        self._listeners[remove_listener] = update_callback
+        return remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the window hour numbers, if used; call once the platforms are set up."""
+        if self.profile is None:
+            self._unsub_index = self._index.async_add_listener(self._handle_index_change)
+            self._async_track_hours()
+        self.async_recompute()
+        self._async_notify()
+
+    @callback
+    def async_set_profile(self, profile: HccWindowProfile) -> None:
+        """Apply edited profile hours; switching to or from numbers needs a reload."""
+        if profile == self.profile:
+            return
+        self.profile = profile
+        self.async_recompute()
+        self._async_notify()
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._unsub_index:
+            self._unsub_index()
+            self._unsub_index = None
+        if self._unsub_hours:
+            self._unsub_hours()
+            self._unsub_hours = None
+        self._async_cancel_timer()
+        self._listeners.clear()
+
+    @callback
+    def async_recompute(self) -> None:
+        """Recompute all windows from the coordinator data and current hours."""
+        data = self._coordinator.data
+        windows: dict[str, Optional[HccWindow]] = {}
+        hours: dict[str, tuple[float, float]] = {}
+        for task_key, bin_color, task_type, pre_key, post_key in WINDOW_TASKS:
+            if self.profile is not None:
+                hours[task_key] = self.profile.hours[task_key]
+            else:
+                hours[task_key] = (
+                    self._get_number_value(pre_key, DEFAULT_PRE_HOURS),
+                    self._get_number_value(post_key, DEFAULT_POST_HOURS),
+                )
+            collection_date = None
+            if data:
+                collection_date = data.red if bin_color == "red" else data.yellow
+            if not collection_date:
+                windows[task_key] = None
+                continue
+
+            windows[task_key] = compute_window(collection_date, task_type, *hours[task_key])
+
+        self.windows = MappingProxyType(windows)
+        self.hours = MappingProxyType(hours)
+        self._async_evaluate()
+
+    @callback
+    def _async_evaluate(self) -> None:
+        now = dt_util.now()
+        self.active = frozenset(
+            task_key for task_key, window in self.windows.items() if window and window.contains(now)
+        )
+
+        next_at = min(
+            (when for window in self.windows.values() if window and (when := window.next_transition(now))),
+            default=None,
+        )
+        if next_at == self._armed_at:
+            return
+
+        self._async_cancel_timer()
+        if next_at is None:
+            return
+
+        self._armed_at = next_at
+        self._unsub_timer = async_track_point_in_time(self._hass, self._handle_transition, next_at)
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = None
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners.values()):
+            update_callback()
+
+    @callback
+    def _handle_transition(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        self._armed_at = None
+        self._async_evaluate()
+        self._async_notify()
+
+    @callback
+    def _handle_hours_change(self, _event: Event) -> None:
+        self.async_recompute()
+        self._async_notify()
+
+    @callback
+    def _handle_index_change(self) -> None:
+        self._async_track_hours()
+        self.async_recompute()
+        self._async_notify()
+
+    @callback
+    def _async_track_hours(self) -> None:
+        if self._unsub_hours:
+            self._unsub_hours()
+            self._unsub_hours = None
+
+        ids_to_track = [
+            eid
+            for _task_key, _bin, _type, pre_key, post_key in WINDOW_TASKS
+            for key in (pre_key, post_key)
+            if (eid := self._index.get("number", key))
+        ]
+        if ids_to_track:
+            self._unsub_hours = async_track_state_change_event(
+                self._hass, ids_to_track, self._handle_hours_change
+            )
+
+    def _get_number_value(self, key_suffix: str, default: float) -> float:
+        if entity_id := self._index.get("number", key_suffix):
+            state = self._hass.states.get(entity_id)
+            if state and state.state not in ("unknown", "unavailable"):
+                try:
+                    return float(state.state)
+                except ValueError:
+                    pass
+        return default
@@ -1,47 +1,410 @@
-import http.server
-import socketserver
+"""
+Asyncio mock of the FightTheLandFill get_Collection_Dates endpoint.
+
+Serves one response per address_string: from a fixtures file when the
+address is listed there, else from data.json with the address filled in, or
+(with --synthetic) from dates derived from the address so large fleets get
+distinct, alternating fortnightly collections.
+
+Faults are injected per request: latency drawn from a distribution, HTTP 500
+errors, malformed JSON, slow-drip bodies and connection resets. Responses
+carry ETag/Last-Modified/Cache-Control and conditional requests get 304.
+
+Control endpoints:
+    GET  /__stats    request counts and timing as JSON
+    POST /__reset    clear the stats
+    POST /__config   change fault settings, e.g. {"error_rate": 0.2}
+
+Run:
+    python server.py --port 8000 --latency uniform:20:200 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
 import os
+import random
+import re
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
 
 PORT = 8000
 DATA_FILE = "data.json"
+# Cache-Control max-age sent with every response (seconds, 0 = must revalidate)
+MAX_AGE = int(os.environ.get("HCC_MOCK_MAX_AGE", "0"))
+# Request timings kept for the percentiles in /__stats
+TIMING_WINDOW = 10000
+# How long the rest of a bad request is read after answering it with 400
+BAD_REQUEST_DRAIN_SECONDS = 2.0
+
+@dataclass
+class FaultConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    reset_rate: float = 0.0
+    slow_drip_rate: float = 0.0
+    drip_chunk_bytes: int = 8
+    drip_interval_ms: float = 50.0
+    max_age: int = MAX_AGE
+
+    def sample_latency(self) -> float:
+        """Seconds to wait before answering, from the configured distribution."""
+        kind, *params = self.latency.split(":")
+        values = [float(p) for p in params]
+        if kind == "fixed":
+            ms = values[0] if values else 0.0
+        elif kind == "uniform":
+            ms = random.uniform(values[0], values[1])
+        elif kind == "normal":
+            ms = random.gauss(values[0], values[1])
+        elif kind == "exp":
+            ms = random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+        elif kind == "lognormal":
+            # Median and sigma, the usual shape of real API latency
+            ms = random.lognormvariate(math.log(values[0]), values[1])
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.latency}")
+        return max(0.0, ms) / 1000
+
+    def update(self, changes: dict) -> None:
+        """Apply the changes only once all of them, latency included, are valid."""
+        if not isinstance(changes, dict):
+            raise TypeError("Expected a JSON object")
+        known = {f.name for f in fields(self)}
+        converted = {}
+        for name, value in changes.items():
+            if name not in known:
+                raise ValueError(f"Unknown setting: {name}")
+            converted[name] = type(getattr(self, name))(value)
+        candidate = replace(self, **converted)
+        candidate.sample_latency()
+        for name, value in converted.items():
+            setattr(self, name, value)
+
+class Stats:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.by_address: Counter[str] = Counter()
+        self.by_outcome: Counter[str] = Counter()
+        self.durations_ms: deque[float] = deque(maxlen=TIMING_WINDOW)
+        self.in_flight = 0
+        self.max_in_flight = 0
 
-class MockRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def do_GET(self):
-        print(f"Received GET request: {self.path}")
+    def as_dict(self) -> dict:
+        ordered = sorted(self.durations_ms)
 
-        if not os.path.exists(DATA_FILE):
-            self.send_error(404, f"File {DATA_FILE} not found")
-            return
+        def percentile(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            rank = math.ceil(q / 100 * len(ordered))
+            return round(ordered[max(0, min(len(ordered), rank) - 1)], 3)
 
+        elapsed = time.monotonic() - self.started
+        return {
+            "requests": self.requests,
+            "requests_per_second": round(self.requests / elapsed, 3) if elapsed > 0 else None,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "outcomes": dict(self.by_outcome),
+            "addresses": len(self.by_address),
+            "requests_per_address": dict(self.by_address.most_common()),
+            "duration_ms": {
+                "count": len(ordered),
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": round(ordered[-1], 3) if ordered else None,
+            },
+        }
+
+def _canonical(address: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", address.lower()))
+
+def _synthetic_body(address: str) -> list[dict]:
+    """Dates derived from the address: red and yellow a week apart, fortnightly."""
+    seed = int(hashlib.sha1(_canonical(address).encode()).hexdigest(), 16)
+    today = date.today()
+    red = today + timedelta(days=seed % 14)
+    yellow = red + timedelta(days=7) if red - today < timedelta(days=7) else red - timedelta(days=7)
+    return [{
+        "Address": address,
+        "RedBin": f"{red.isoformat()}T00:00:00",
+        "YellowBin": f"{yellow.isoformat()}T00:00:00",
+        "CollectionWeek": 1 + seed % 2,
+        "CollectionDay": red.isoweekday(),
+    }]
+
+class MockServer:
+    def __init__(
+        self,
+        faults: Optional[FaultConfig] = None,
+        data_file: Optional[str] = DATA_FILE,
+        fixtures_file: Optional[str] = None,
+        synthetic: bool = False,
+    ) -> None:
+        self.faults = faults or FaultConfig()
+        self.stats = Stats()
+        self._synthetic = synthetic
+        self._default: Optional[list] = None
+        if data_file and os.path.exists(data_file):
+            with open(data_file, "rb") as f:
+                self._default = json.loads(f.read())
+        self._fixtures: dict[str, object] = {}
+        if fixtures_file:
+            with open(fixtures_file, "rb") as f:
+                self._fixtures = {_canonical(k): v for k, v in json.loads(f.read()).items()}
+        # Validators stay stable while a body is unchanged
+        self._started = int(time.time())
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "0.0.0.0", port: int = PORT) -> int:
+        self._server = await asyncio.start_server(self._handle_connection, host, port, reuse_address=True)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def body_for(self, address: str) -> Optional[bytes]:
+        if (fixture := self._fixtures.get(_canonical(address))) is not None:
+            return json.dumps(fixture).encode()
+        if self._synthetic:
+            return json.dumps(_synthetic_body(address)).encode()
+        if self._default is not None:
+            body = [dict(item, Address=address) for item in self._default] if address else self._default
+            return json.dumps(body).encode()
+        return None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         try:
-            # 1. Read file in BINARY mode ("rb") to get exact byte count
-            with open(DATA_FILE, "rb") as f:
-                data = f.read()
-            
-            # 2. Send headers
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.send_header("Content-Length", str(len(data)))
-            self.end_headers()
-
-            # 3. Send binary data directly
-            self.wfile.write(data)
-            self.wfile.flush() # Force send
-            
-        except Exception as e:
-            print(f"Error: {e}")
-            # Only try to send error if headers haven't been sent
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if not await self._handle_request(method, target, headers, body, writer, keep_alive):
+                    return
+                if not keep_alive:
+                    break
+        except _BadRequest as ex:
+            _write(writer, 400, {"Content-Type": "text/plain"}, str(ex).encode(), keep_alive=False)
             try:
-                self.send_error(500, str(e))
-            except:
+                await writer.drain()
+                # Closing with unread input resets the connection, which could
+                # discard the 400 before the client reads it; drain the rest first.
+                writer.write_eof()
+                await asyncio.wait_for(_discard(reader), BAD_REQUEST_DRAIN_SECONDS)
+            except (ConnectionError, asyncio.TimeoutError):
                 pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if not writer.is_closing():
+                writer.close()
 
-# Enable address reuse to prevent "Address already in use" errors on restart
-socketserver.TCPServer.allow_reuse_address = True
+    async def _handle_request(self, method, target, headers, body, writer, keep_alive) -> bool:
+        """Answer one request; return False once the connection has been dropped."""
+        url = urlsplit(target)
+        if url.path == "/__stats":
+            _write(writer, 200, {"Content-Type": "application/json"}, json.dumps(self.stats.as_dict()).encode(), keep_alive)
+            return True
+        if url.path == "/__reset" and method == "POST":
+            self.stats.reset()
+            _write(writer, 204, {}, b"", keep_alive)
+            return True
+        if url.path == "/__config" and method == "POST":
+            try:
+                self.faults.update(json.loads(body or b"{}"))
+            except (ValueError, TypeError, IndexError) as ex:
+                _write(writer, 400, {"Content-Type": "text/plain"}, str(ex).encode(), keep_alive)
+                return True
+            _write(writer, 200, {"Content-Type": "application/json"}, json.dumps(asdict(self.faults)).encode(), keep_alive)
+            return True
+        if method != "GET":
+            _write(writer, 405, {}, b"", keep_alive)
+            return True
+
+        address = parse_qs(url.query).get("address_string", [""])[0]
+        stats = self.stats
+        stats.requests += 1
+        stats.by_address[address] += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        started = time.perf_counter()
+        try:
+            outcome = await self._answer(address, headers, writer, keep_alive)
+        finally:
+            stats.in_flight -= 1
+            stats.durations_ms.append((time.perf_counter() - started) * 1000)
+        stats.by_outcome[outcome] += 1
+        return outcome != "reset"
+
+    async def _answer(self, address, headers, writer, keep_alive) -> str:
+        faults = self.faults
+        await asyncio.sleep(faults.sample_latency())
+
+        roll = random.random()
+        if roll < faults.reset_rate:
+            writer.transport.abort()
+            return "reset"
+        roll -= faults.reset_rate
+        if roll < faults.error_rate:
+            _write(writer, 500, {"Content-Type": "text/plain"}, b"Injected failure", keep_alive)
+            return "error"
+        roll -= faults.error_rate
+
+        data = self.body_for(address)
+        if data is None:
+            _write(writer, 404, {"Content-Type": "text/plain"}, f"{DATA_FILE} not found".encode(), keep_alive)
+            return "not_found"
+
+        if roll < faults.malformed_rate:
+            _write(writer, 200, {"Content-Type": "application/json"}, data[: max(1, len(data) // 2)], keep_alive)
+            return "malformed"
+        roll -= faults.malformed_rate
+
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        cache_headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(self._started, usegmt=True),
+            "Cache-Control": f"max-age={faults.max_age}",
+        }
+        if _not_modified(headers, etag, self._started):
+            _write(writer, 304, cache_headers, b"", keep_alive)
+            return "not_modified"
+
+        response_headers = {"Content-Type": "application/json", **cache_headers}
+        if roll < faults.slow_drip_rate:
+            _write(writer, 200, response_headers, b"", keep_alive, content_length=len(data))
+            for i in range(0, len(data), faults.drip_chunk_bytes):
+                await asyncio.sleep(faults.drip_interval_ms / 1000)
+                writer.write(data[i:i + faults.drip_chunk_bytes])
+                await writer.drain()
+            return "slow_drip"
+
+        _write(writer, 200, response_headers, data, keep_alive)
+        await writer.drain()
+        return "ok"
+
+async def _discard(reader: asyncio.StreamReader) -> None:
+    while await reader.read(65536):
+        pass
+
+class _BadRequest(Exception):
+    """A request that cannot be parsed; answered with 400 and the connection closed."""
+
+async def _read_request(reader: asyncio.StreamReader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError as ex:
+        raise _BadRequest("Request head too large") from ex
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError as ex:
+        raise _BadRequest("Malformed request line") from ex
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError as ex:
+        raise _BadRequest("Malformed Content-Length") from ex
+    if length < 0:
+        raise _BadRequest("Negative Content-Length")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+def _write(writer, status: int, headers: dict, body: bytes, keep_alive: bool, content_length: Optional[int] = None) -> None:
+    reason = {200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+              405: "Method Not Allowed", 500: "Internal Server Error"}[status]
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    all_headers = {
+        "Date": formatdate(usegmt=True),
+        "Connection": "keep-alive" if keep_alive else "close",
+        **headers,
+    }
+    if status not in (204, 304):
+        all_headers["Content-Length"] = str(len(body) if content_length is None else content_length)
+    lines += [f"{name}: {value}" for name, value in all_headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+def _not_modified(headers: dict, etag: str, mtime: int) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--data", default=DATA_FILE, help="default response, served for unknown addresses")
+    parser.add_argument("--fixtures", help="JSON object mapping address_string to its response body")
+    parser.add_argument("--synthetic", action="store_true", help="derive dates from unknown addresses")
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS | uniform:MIN:MAX | normal:MEAN:SD | exp:MEAN | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered with HTTP 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="fraction answered with truncated JSON")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="fraction whose connection is reset")
+    parser.add_argument("--slow-drip-rate", type=float, default=0.0, help="fraction whose body trickles out")
+    parser.add_argument("--drip-chunk-bytes", type=int, default=8)
+    parser.add_argument("--drip-interval-ms", type=float, default=50.0)
+    parser.add_argument("--max-age", type=int, default=MAX_AGE)
+    return parser.parse_args()
+
+async def _main() -> None:
+    args = _parse_args()
+    faults = FaultConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        reset_rate=args.reset_rate,
+        slow_drip_rate=args.slow_drip_rate,
+        drip_chunk_bytes=args.drip_chunk_bytes,
+        drip_interval_ms=args.drip_interval_ms,
+        max_age=args.max_age,
+    )
+    faults.sample_latency()
+    server = MockServer(faults, args.data, args.fixtures, args.synthetic)
+    port = await server.start(args.host, args.port)
+    print(f"Serving FightTheLandFill mock on {args.host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(json.dumps(server.stats.as_dict(), indent=2))
 
-with socketserver.TCPServer(("0.0.0.0", PORT), MockRequestHandler) as httpd:
-    print(f"Serving '{DATA_FILE}' on port {PORT} (IPv4)")
+if __name__ == "__main__":
     try:
-        httpd.serve_forever()
+        asyncio.run(_main())
     except KeyboardInterrupt:
-        print("\nServer stopped.")
\ No newline at end of file
+        print("\nServer stopped.")
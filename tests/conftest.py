@@ -0,0 +1,32 @@
+"""Fixtures for the hcc tests; needs pytest-homeassistant-custom-component."""
+
+import pytest
+
+from custom_components.hcc import api, config_flow, services
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+class MonotonicClock:
+    """Stands in for the time module of the integration's caches; moved by the test."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def tick(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch) -> MonotonicClock:
+    """Freeze the monotonic clock read by the breaker, coalescer, validation cache and refresh service."""
+    clock = MonotonicClock()
+    for module in (api, config_flow, services):
+        monkeypatch.setattr(module, "time", clock)
+    return clock
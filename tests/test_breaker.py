@@ -0,0 +1,94 @@
+"""Circuit breaker shared by the clients of one API host."""
+
+import pytest
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.hcc.api import HccApiClient, HccCircuitBreaker, HccCircuitOpenError, get_circuit_breaker
+from custom_components.hcc.const import API_BASE, BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN
+
+def _fail(breaker: HccCircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record_failure()
+
+async def test_breaker_opens_at_threshold(clock) -> None:
+    breaker = HccCircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    _fail(breaker, 2)
+    assert breaker.state == BREAKER_CLOSED
+    _fail(breaker, 1)
+    assert breaker.state == BREAKER_OPEN
+
+    # Fails fast without a request until the reset timeout has passed.
+    clock.tick(59)
+    with pytest.raises(HccCircuitOpenError):
+        breaker.before_request()
+
+async def test_breaker_success_resets_failure_count(clock) -> None:
+    breaker = HccCircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    _fail(breaker, 2)
+    breaker.before_request()
+    breaker.record_success()
+    _fail(breaker, 2)
+
+    assert breaker.state == BREAKER_CLOSED
+
+async def test_breaker_half_open_lets_one_probe_through(clock) -> None:
+    breaker = HccCircuitBreaker(failure_threshold=1, reset_timeout=60)
+    _fail(breaker, 1)
+
+    clock.tick(60)
+    breaker.before_request()
+    assert breaker.state == BREAKER_HALF_OPEN
+    with pytest.raises(HccCircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    breaker.before_request()
+
+async def test_breaker_failed_probe_reopens(clock) -> None:
+    breaker = HccCircuitBreaker(failure_threshold=5, reset_timeout=60)
+    _fail(breaker, 5)
+
+    clock.tick(60)
+    _fail(breaker, 1)
+    assert breaker.state == BREAKER_OPEN
+
+    # The reset timeout starts over from the failed probe.
+    clock.tick(59)
+    with pytest.raises(HccCircuitOpenError):
+        breaker.before_request()
+    clock.tick(1)
+    breaker.before_request()
+    assert breaker.state == BREAKER_HALF_OPEN
+
+async def test_breaker_release_frees_the_probe(clock) -> None:
+    breaker = HccCircuitBreaker(failure_threshold=1, reset_timeout=60)
+    _fail(breaker, 1)
+    clock.tick(60)
+
+    breaker.before_request()
+    breaker.release()
+    breaker.before_request()
+
+    assert breaker.state == BREAKER_HALF_OPEN
+
+async def test_breaker_is_shared_per_host(hass) -> None:
+    first = get_circuit_breaker(hass, "https://API.example.com/a")
+
+    assert get_circuit_breaker(hass, "https://api.example.com/b") is first
+    assert get_circuit_breaker(hass, "https://other.example.com/a") is not first
+
+async def test_bad_payload_does_not_trip_the_breaker(hass, aioclient_mock, clock) -> None:
+    aioclient_mock.get(API_BASE, text="not json")
+    breaker = HccCircuitBreaker(failure_threshold=1, reset_timeout=60)
+    client = HccApiClient(async_get_clientsession(hass), breaker=breaker)
+
+    with pytest.raises(ValueError):
+        await client.fetch_collection_dates("1 Test Street")
+
+    # The host answered: no retry, and the breaker stays closed.
+    assert aioclient_mock.call_count == 1
+    assert breaker.state == BREAKER_CLOSED
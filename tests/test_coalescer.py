@@ -0,0 +1,100 @@
+"""Single-flight coalescing of collection date requests."""
+
+import asyncio
+from datetime import date
+from typing import Optional
+
+import aiohttp
+import pytest
+
+from custom_components.hcc.api import HccRequestCoalescer
+from custom_components.hcc.const import API_BASE
+
+DATES = (date(2025, 6, 2), date(2025, 6, 9))
+KEY = (API_BASE, "1 test street")
+
+class _Fetch:
+    """A fetch callable counting its calls; blocks until released when given an event."""
+
+    def __init__(self, release: Optional[asyncio.Event] = None, error: Optional[Exception] = None) -> None:
+        self.calls = 0
+        self._release = release
+        self._error = error
+
+    async def __call__(self):
+        self.calls += 1
+        if self._release is not None:
+            await self._release.wait()
+        if self._error is not None:
+            raise self._error
+        return DATES
+
+async def test_coalescer_shares_one_request(clock) -> None:
+    coalescer = HccRequestCoalescer(freshness=30)
+    release = asyncio.Event()
+    fetch = _Fetch(release)
+
+    callers = [asyncio.ensure_future(coalescer.async_fetch(KEY, fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == [DATES] * 3
+    assert fetch.calls == 1
+
+async def test_coalescer_serves_recent_results(clock) -> None:
+    coalescer = HccRequestCoalescer(freshness=30)
+    fetch = _Fetch()
+
+    await coalescer.async_fetch(KEY, fetch)
+    clock.tick(29)
+    assert await coalescer.async_fetch(KEY, fetch) == DATES
+    assert fetch.calls == 1
+
+    clock.tick(1)
+    await coalescer.async_fetch(KEY, fetch)
+    assert fetch.calls == 2
+
+async def test_coalescer_without_freshness_always_fetches(clock) -> None:
+    coalescer = HccRequestCoalescer(freshness=0)
+    fetch = _Fetch()
+
+    await coalescer.async_fetch(KEY, fetch)
+    await coalescer.async_fetch(KEY, fetch)
+
+    assert fetch.calls == 2
+
+async def test_coalescer_does_not_remember_failures(clock) -> None:
+    coalescer = HccRequestCoalescer(freshness=30)
+    failing = _Fetch(error=aiohttp.ClientError())
+
+    with pytest.raises(aiohttp.ClientError):
+        await coalescer.async_fetch(KEY, failing)
+
+    fetch = _Fetch()
+    assert await coalescer.async_fetch(KEY, fetch) == DATES
+    assert fetch.calls == 1
+
+async def test_coalescer_cancelled_caller_keeps_shared_request(clock) -> None:
+    coalescer = HccRequestCoalescer(freshness=30)
+    release = asyncio.Event()
+    fetch = _Fetch(release)
+
+    cancelled = asyncio.ensure_future(coalescer.async_fetch(KEY, fetch))
+    waiting = asyncio.ensure_future(coalescer.async_fetch(KEY, fetch))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert await waiting == DATES
+    assert fetch.calls == 1
+
+async def test_coalescer_drops_stale_results(clock) -> None:
+    coalescer = HccRequestCoalescer(freshness=30)
+    other = (API_BASE, "2 test street")
+
+    await coalescer.async_fetch(KEY, _Fetch())
+    clock.tick(30)
+    await coalescer.async_fetch(other, _Fetch())
+
+    # Completing the second request evicts the first, which went stale unasked.
+    assert list(coalescer._recent) == [other]
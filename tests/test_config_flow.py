@@ -0,0 +1,89 @@
+"""Validation cache of the config flow: how long outcomes are reused, and by which flows."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant import config_entries
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.hcc.config_flow import HccValidationCache
+from custom_components.hcc.const import (
+    API_BASE,
+    CONF_ADDRESS,
+    DATA_VALIDATION,
+    DOMAIN,
+    VALIDATION_CACHE_TTL_SECONDS,
+    VALIDATION_NEGATIVE_TTL_SECONDS,
+)
+
+ADDRESS = "1 Test Street, Hamilton"
+KEY = (API_BASE, "1 test street hamilton")
+
+@pytest.fixture(autouse=True)
+def no_setup():
+    # Flows are under test, not the entries they create.
+    with patch("custom_components.hcc.async_setup_entry", return_value=True):
+        yield
+
+async def _start(hass, source: str):
+    return await hass.config_entries.flow.async_init(DOMAIN, context={"source": source}, data={CONF_ADDRESS: ADDRESS})
+
+async def test_cache_ttls(clock) -> None:
+    cache = HccValidationCache()
+    other = (API_BASE, "2 test street hamilton")
+    cache.set(KEY, None)
+    cache.set(other, "cannot_connect")
+
+    clock.tick(VALIDATION_NEGATIVE_TTL_SECONDS - 1)
+    assert cache.get(other).error == "cannot_connect"
+    clock.tick(1)
+    assert cache.get(other) is None
+
+    clock.tick(VALIDATION_CACHE_TTL_SECONDS - VALIDATION_NEGATIVE_TTL_SECONDS - 1)
+    assert cache.get(KEY).error is None
+    clock.tick(1)
+    assert cache.get(KEY) is None
+
+async def test_zero_ttl_is_not_cached(clock) -> None:
+    cache = HccValidationCache(ttl=0, negative_ttl=0)
+    cache.set(KEY, None)
+    cache.set((API_BASE, "2 test street hamilton"), "cannot_connect")
+
+    assert cache.get(KEY) is None
+    assert cache.get((API_BASE, "2 test street hamilton")) is None
+
+async def test_import_reuses_a_recent_failure(hass, aioclient_mock, clock) -> None:
+    aioclient_mock.get(API_BASE, text="not json")
+
+    for _ in range(2):
+        result = await _start(hass, config_entries.SOURCE_IMPORT)
+        assert result["type"] is FlowResultType.ABORT
+        assert result["reason"] == "invalid_response"
+    assert aioclient_mock.call_count == 1
+
+    clock.tick(VALIDATION_NEGATIVE_TTL_SECONDS)
+    await _start(hass, config_entries.SOURCE_IMPORT)
+    assert aioclient_mock.call_count == 2
+
+async def test_user_retry_after_failure_fetches_again(hass, aioclient_mock, clock) -> None:
+    aioclient_mock.get(API_BASE, text="not json")
+
+    for calls in (1, 2):
+        result = await _start(hass, config_entries.SOURCE_USER)
+        assert result["type"] is FlowResultType.FORM
+        assert result["errors"] == {"base": "invalid_response"}
+        assert aioclient_mock.call_count == calls
+
+async def test_recent_success_skips_the_fetch(hass, aioclient_mock, clock) -> None:
+    aioclient_mock.get(
+        API_BASE,
+        json=[{"Address": ADDRESS, "RedBin": "2025-06-02T00:00:00", "YellowBin": "2025-06-09T00:00:00"}],
+    )
+    cache = HccValidationCache()
+    hass.data.setdefault(DOMAIN, {})[DATA_VALIDATION] = cache
+    cache.set(KEY, None)
+
+    result = await _start(hass, config_entries.SOURCE_USER)
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert aioclient_mock.call_count == 0
@@ -0,0 +1,86 @@
+"""Change detection and context-filtered listener notification of the coordinator."""
+
+from dataclasses import replace
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.hcc.const import BREAKER_CLOSED, BREAKER_OPEN, STATUS_SUCCESS
+from custom_components.hcc.coordinator import (
+    BREAKER_STATE,
+    HCC_DATA_FIELDS,
+    HccCoordinator,
+    HccData,
+    changed_fields,
+)
+from custom_components.hcc.metrics import HccFetchMetrics
+
+DATA = HccData(
+    red=date(2025, 6, 2),
+    yellow=date(2025, 6, 9),
+    last_status_ok=True,
+    last_status_text=STATUS_SUCCESS,
+    version=1,
+)
+
+CONTEXTS = {
+    "red": frozenset({"red"}),
+    "yellow": frozenset({"yellow"}),
+    "status": frozenset({"last_status_text", BREAKER_STATE}),
+    "always": None,
+}
+
+@pytest.fixture
+async def coordinator(hass):
+    client = SimpleNamespace(metrics=HccFetchMetrics(), profiler=None, breaker_state=BREAKER_CLOSED)
+    coordinator = HccCoordinator(hass, "1 Test Street", None, client)
+    yield coordinator
+    await coordinator.async_shutdown()
+
+@pytest.fixture
+async def notified(coordinator) -> list[str]:
+    calls: list[str] = []
+    for name, context in CONTEXTS.items():
+        coordinator.async_add_listener(lambda name=name: calls.append(name), context)
+    # The first notification reaches everyone; start from a known snapshot.
+    coordinator.async_set_updated_data(DATA)
+    calls.clear()
+    return calls
+
+async def test_changed_fields() -> None:
+    assert changed_fields(None, DATA) == HCC_DATA_FIELDS
+    assert changed_fields(DATA, replace(DATA, version=2)) == {"version"}
+    assert changed_fields(DATA, replace(DATA, red=date(2025, 6, 16), version=2)) == {"red", "version"}
+
+async def test_version_is_not_part_of_equality() -> None:
+    assert replace(DATA, version=5) == DATA
+
+async def test_only_listeners_of_changed_fields_are_notified(coordinator, notified) -> None:
+    coordinator.async_set_updated_data(replace(DATA, red=date(2025, 6, 16), version=2))
+
+    assert notified == ["red", "always"]
+
+async def test_unchanged_fetch_notifies_only_unfiltered_listeners(coordinator, notified) -> None:
+    coordinator.async_set_updated_data(replace(DATA, version=2))
+
+    assert notified == ["always"]
+
+async def test_breaker_change_notifies_its_listeners(coordinator, notified) -> None:
+    coordinator.client.breaker_state = BREAKER_OPEN
+    coordinator.async_set_updated_data(DATA)
+
+    assert notified == ["status", "always"]
+
+async def test_success_change_notifies_everyone(coordinator, notified) -> None:
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+
+    assert notified == list(CONTEXTS)
+
+async def test_date_change_recomputes_windows(coordinator, notified) -> None:
+    red = date(2025, 6, 16)
+    coordinator.async_set_updated_data(replace(DATA, red=red, version=2))
+
+    assert dt_util.as_local(coordinator.windows.get("red_bin_put_out").end).date() == red
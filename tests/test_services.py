@@ -0,0 +1,89 @@
+"""The hcc.refresh service: targets, results and the per-address debounce."""
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.hcc.const import (
+    API_BASE,
+    ATTR_CONFIG_ENTRY_ID,
+    CONF_ADDRESS,
+    DOMAIN,
+    REFRESH_DEBOUNCE_SECONDS,
+    SERVICE_REFRESH,
+    STATUS_SUCCESS,
+    canonical_address,
+)
+
+ADDRESSES = ["1 Test Street, Hamilton", "2 Test Street, Hamilton"]
+
+@pytest.fixture
+async def entries(hass, aioclient_mock, clock) -> list[MockConfigEntry]:
+    aioclient_mock.get(
+        API_BASE,
+        json=[{"RedBin": "2025-06-02T00:00:00", "YellowBin": "2025-06-09T00:00:00"}],
+    )
+    entries = []
+    for address in ADDRESSES:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"HCC Bin: {address}",
+            data={CONF_ADDRESS: address},
+            unique_id=f"hcc_bin_{canonical_address(address)}",
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    for entry in entries:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    # Entries without a snapshot fetch right after setup.
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return entries
+
+async def _refresh(hass, **data) -> dict:
+    response = await hass.services.async_call(DOMAIN, SERVICE_REFRESH, data, blocking=True, return_response=True)
+    return response["results"]
+
+async def test_refresh_reports_every_address(hass, entries) -> None:
+    results = await _refresh(hass)
+
+    assert results == {
+        canonical_address(entry.data[CONF_ADDRESS]): {
+            "address": entry.data[CONF_ADDRESS],
+            "config_entry_id": entry.entry_id,
+            "status": STATUS_SUCCESS,
+            "red": "2025-06-02",
+            "yellow": "2025-06-09",
+            "coalesced": False,
+        }
+        for entry in entries
+    }
+
+async def test_refresh_targets(hass, entries) -> None:
+    first, second = entries
+
+    # Addresses match however they are spelled.
+    results = await _refresh(hass, **{CONF_ADDRESS: "1 TEST STREET HAMILTON"})
+    assert list(results) == [canonical_address(first.data[CONF_ADDRESS])]
+
+    results = await _refresh(hass, **{ATTR_CONFIG_ENTRY_ID: second.entry_id})
+    assert list(results) == [canonical_address(second.data[CONF_ADDRESS])]
+
+    with pytest.raises(ServiceValidationError):
+        await _refresh(hass, **{CONF_ADDRESS: "3 Test Street"})
+    with pytest.raises(ServiceValidationError):
+        await _refresh(hass, **{ATTR_CONFIG_ENTRY_ID: "unknown"})
+
+async def test_refresh_debounce(hass, entries, aioclient_mock, clock) -> None:
+    await _refresh(hass)
+
+    # Within the debounce window the earlier refresh is reported, not repeated.
+    clock.tick(REFRESH_DEBOUNCE_SECONDS - 1)
+    calls = aioclient_mock.call_count
+    results = await _refresh(hass)
+    assert all(result["coalesced"] for result in results.values())
+    assert aioclient_mock.call_count == calls
+
+    clock.tick(1)
+    results = await _refresh(hass)
+    assert not any(result["coalesced"] for result in results.values())
+    assert aioclient_mock.call_count == calls + len(entries)
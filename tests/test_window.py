@@ -0,0 +1,106 @@
+"""Window bounds and transition timers across the Pacific/Auckland DST changeovers."""
+
+from datetime import date, datetime, timezone
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.hcc.coordinator import HccData
+from custom_components.hcc.entity_index import HccEntityIndex
+from custom_components.hcc.window import HccWindowModel, HccWindowProfile, compute_window
+
+TIME_ZONE = "Pacific/Auckland"
+
+# 2025-04-06: NZDT ends, 03:00 goes back to 02:00 and 02:00-03:00 happens twice.
+DST_ENDS = date(2025, 4, 6)
+# 2025-09-28: NZDT starts, 02:00 jumps to 03:00 and 02:00-03:00 never happens.
+DST_STARTS = date(2025, 9, 28)
+
+# Put-out ends and bring-in starts inside the changeover hour.
+PROFILE = HccWindowProfile.from_options({
+    "red_bin_put_out": {"pre": 6, "post": 2.5},
+    "red_bin_bring_in": {"pre": 21.25, "post": 5},
+})
+
+def _utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+class _Coordinator:
+    def __init__(self, red: date) -> None:
+        self.data = HccData(red=red)
+
+@pytest.fixture
+async def auckland(hass):
+    await hass.config.async_set_time_zone(TIME_ZONE)
+    return hass
+
+@pytest.mark.parametrize(
+    ("collection_date", "task_type", "pre", "post", "start", "end"),
+    [
+        # 18:00 NZDT to 08:00 NZST: 14 wall-clock hours, 15 real ones.
+        (DST_ENDS, "out", 6, 8, _utc(2025, 4, 5, 5), _utc(2025, 4, 5, 20)),
+        # 02:30 happens twice; the bound is the first (NZDT) one.
+        (DST_ENDS, "out", 6, 2.5, _utc(2025, 4, 5, 5), _utc(2025, 4, 5, 13, 30)),
+        (DST_ENDS, "in", 21.25, 5, _utc(2025, 4, 5, 13, 45), _utc(2025, 4, 6, 17)),
+        # 18:00 NZST to 08:00 NZDT: 14 wall-clock hours, 13 real ones.
+        (DST_STARTS, "out", 6, 8, _utc(2025, 9, 27, 6), _utc(2025, 9, 27, 19)),
+        # 02:30 does not exist; the bound resolves past the gap, to 03:30 NZDT.
+        (DST_STARTS, "out", 6, 2.5, _utc(2025, 9, 27, 6), _utc(2025, 9, 27, 14, 30)),
+        (DST_STARTS, "in", 21.25, 5, _utc(2025, 9, 27, 14, 45), _utc(2025, 9, 28, 16)),
+    ],
+)
+async def test_window_table_across_changeover(
+    auckland, collection_date, task_type, pre, post, start, end
+) -> None:
+    window = compute_window(collection_date, task_type, pre, post)
+
+    assert (window.start, window.end) == (start, end)
+    # Served from the table the second time.
+    assert compute_window(collection_date, task_type, pre, post) is window
+
+@pytest.mark.parametrize(
+    ("collection_date", "now", "transitions"),
+    [
+        (
+            DST_ENDS,
+            _utc(2025, 4, 5, 0),
+            [
+                (_utc(2025, 4, 5, 5), {"red_bin_put_out"}),
+                (_utc(2025, 4, 5, 13, 30, 1), set()),
+                (_utc(2025, 4, 5, 13, 45), {"red_bin_bring_in"}),
+                (_utc(2025, 4, 6, 17, 0, 1), set()),
+            ],
+        ),
+        (
+            DST_STARTS,
+            _utc(2025, 9, 27, 0),
+            [
+                (_utc(2025, 9, 27, 6), {"red_bin_put_out"}),
+                (_utc(2025, 9, 27, 14, 30, 1), set()),
+                (_utc(2025, 9, 27, 14, 45), {"red_bin_bring_in"}),
+                (_utc(2025, 9, 28, 16, 0, 1), set()),
+            ],
+        ),
+    ],
+)
+async def test_window_timer_across_changeover(auckland, freezer, collection_date, now, transitions) -> None:
+    hass = auckland
+    freezer.move_to(now)
+    model = HccWindowModel(hass, _Coordinator(collection_date), HccEntityIndex(hass, "dst"), PROFILE)
+    notified = []
+    model.async_add_listener(lambda: notified.append(model.active))
+    model.async_start()
+    assert model.active == frozenset()
+
+    # Fast-forward from timer to timer: each fires at the instant it was armed for.
+    for armed_at, active in transitions:
+        assert model._armed_at == armed_at
+        freezer.move_to(armed_at)
+        async_fire_time_changed(hass, armed_at)
+        await hass.async_block_till_done()
+        assert model.active == active
+        assert notified[-1] == active
+
+    assert model._armed_at is None
+    assert len(notified) == len(transitions) + 1
+    model.async_shutdown()